@@ -1,5 +1,10 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
+from openpyxl import load_workbook
+
+from data_io import write_table
 
 # Option A: relative path (your file inside data folder)
 XLSX_PATH = Path("data") / "WAI_data.xlsx"
@@ -11,75 +16,90 @@ def norm_col(c: str) -> str:
     return str(c).strip().lower().replace("\n", " ").replace("  ", " ")
 
 
+def cell_text(v) -> str:
+    """Cell as text the way pandas read it (empty cells -> "nan"); not stripped."""
+    return str(float("nan") if v is None else v)
+
+
 def load_excel(xlsx_path: Path):
     if not xlsx_path.exists():
         raise FileNotFoundError(f"Excel not found at: {xlsx_path.resolve()}")
 
-    xl = pd.ExcelFile(xlsx_path)
+    # Read-only mode streams each sheet instead of building the full cell tree
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
 
     courses_rows = []
-    enroll_rows = []
-    students_map = {}  # student_id -> student_name
-
-    for sheet in xl.sheet_names:
-        # Raw read to capture B1 faculty and B2 course name
-        raw = xl.parse(sheet_name=sheet, header=None)
-
-        # Based on your format:
-        # A1 is label "Faculty Name"
-        # B1 is actual faculty string
-        # B2 is course name
-        faculty = str(raw.iat[0, 1]).strip() if raw.shape[1] > 1 else ""
-        course_name = str(raw.iat[1, 1]).strip() if raw.shape[1] > 1 else ""
-
-        # Student table starts with header on Row 3 (0-index row 2)
-        df = xl.parse(sheet_name=sheet, header=2)
-        df.columns = [norm_col(c) for c in df.columns]
-
-        # Detect student id and student name columns robustly
-        sid_candidates = [c for c in df.columns if ("student id" in c) or (c == "sid") or (c == "id")]
-        name_candidates = [c for c in df.columns if ("student name" in c) or (c == "name")]
-
-        if not sid_candidates or not name_candidates:
-            print(f"\n[DEBUG] Sheet: {sheet}")
-            print("Columns found:", df.columns.tolist())
-            raise ValueError("Could not detect Student ID / Student Name columns. Check headers in Row 3.")
-
-        sid_col = sid_candidates[0]
-        name_col = name_candidates[0]
-
-        roster = df[[sid_col, name_col]].copy()
-        roster.columns = ["student_id", "student_name"]
-        roster = roster.dropna(subset=["student_id"])
-
-        roster["student_id"] = roster["student_id"].astype(str).str.strip()
-        roster["student_name"] = roster["student_name"].astype(str).str.strip()
-
-        # Remove junk rows
-        roster = roster[roster["student_id"].str.len() > 0]
-        roster = roster[~roster["student_id"].str.lower().str.contains("student")]
-
-        # Course row
-        courses_rows.append(
-            {
-                "course_id": sheet.strip(),
-                "course_name": course_name,
-                "faculty_raw": faculty,  # raw faculty string (may include premid/postmid)
-            }
-        )
-
-        # Enrollment rows + student map
-        for sid, sname in zip(roster["student_id"], roster["student_name"]):
-            students_map.setdefault(sid, sname)
-            enroll_rows.append({"course_id": sheet.strip(), "student_id": sid})
+    # Roster columns, collected raw and trimmed in one Arrow pass below
+    roster_course, roster_sid, roster_name = [], [], []
+
+    try:
+        for sheet in wb.sheetnames:
+            rows = wb[sheet].iter_rows(values_only=True)
+
+            # Based on your format:
+            # A1 is label "Faculty Name"
+            # B1 is actual faculty string
+            # B2 is course name
+            row1 = next(rows, ())
+            row2 = next(rows, ())
+            faculty = cell_text(row1[1]).strip() if len(row1) > 1 else ""
+            course_name = cell_text(row2[1]).strip() if len(row2) > 1 else ""
+
+            # Student table starts with header on Row 3
+            header = [norm_col(c) for c in next(rows, ())]
+
+            # Detect student id and student name columns robustly
+            sid_candidates = [i for i, c in enumerate(header) if ("student id" in c) or (c == "sid") or (c == "id")]
+            name_candidates = [i for i, c in enumerate(header) if ("student name" in c) or (c == "name")]
+
+            if not sid_candidates or not name_candidates:
+                print(f"\n[DEBUG] Sheet: {sheet}")
+                print("Columns found:", header)
+                raise ValueError("Could not detect Student ID / Student Name columns. Check headers in Row 3.")
+
+            sid_idx = sid_candidates[0]
+            name_idx = name_candidates[0]
+
+            # Course row
+            courses_rows.append(
+                {
+                    "course_id": sheet.strip(),
+                    "course_name": course_name,
+                    "faculty_raw": faculty,  # raw faculty string (may include premid/postmid)
+                }
+            )
+
+            # Roster rows (blank student id = not a student row)
+            for row in rows:
+                raw_sid = row[sid_idx] if sid_idx < len(row) else None
+                if raw_sid is None:
+                    continue
+                roster_course.append(sheet)
+                roster_sid.append(cell_text(raw_sid))
+                roster_name.append(cell_text(row[name_idx] if name_idx < len(row) else None))
+    finally:
+        wb.close()
+
+    # Strip every string exactly once, here at ingest; downstream scripts read them as-is
+    roster = pa.table({
+        "course_id": pc.utf8_trim_whitespace(pa.array(roster_course, type=pa.string())),
+        "student_id": pc.utf8_trim_whitespace(pa.array(roster_sid, type=pa.string())),
+        "student_name": pc.utf8_trim_whitespace(pa.array(roster_name, type=pa.string())),
+    })
+
+    # Remove junk rows
+    sid = roster.column("student_id")
+    keep = pc.and_(pc.greater(pc.utf8_length(sid), 0), pc.invert(pc.match_substring(pc.utf8_lower(sid), "student")))
+    roster = roster.filter(keep).to_pandas()
 
     courses_df = pd.DataFrame(courses_rows).drop_duplicates("course_id").reset_index(drop=True)
     students_df = (
-        pd.DataFrame([{"student_id": k, "student_name": v} for k, v in students_map.items()])
+        roster[["student_id", "student_name"]]
+        .drop_duplicates("student_id")  # first name seen wins
         .sort_values("student_id")
         .reset_index(drop=True)
     )
-    enrollments_df = pd.DataFrame(enroll_rows).drop_duplicates().reset_index(drop=True)
+    enrollments_df = roster[["course_id", "student_id"]].drop_duplicates().reset_index(drop=True)
 
     return courses_df, students_df, enrollments_df
 
@@ -127,9 +147,9 @@ if __name__ == "__main__":
     counts, split, fac_load = basic_queries(courses_df, students_df, enrollments_df)
 
     # Save outputs for later use
-    courses_df.to_csv(OUTPUT_DIR / "courses.csv", index=False)
-    students_df.to_csv(OUTPUT_DIR / "students.csv", index=False)
-    enrollments_df.to_csv(OUTPUT_DIR / "enrollments.csv", index=False)
-    counts.to_csv(OUTPUT_DIR / "course_enrollment_counts.csv", index=False)
+    write_table(courses_df, OUTPUT_DIR / "courses.csv")
+    write_table(students_df, OUTPUT_DIR / "students.csv")
+    write_table(enrollments_df, OUTPUT_DIR / "enrollments.csv")
+    write_table(counts, OUTPUT_DIR / "course_enrollment_counts.csv")
 
-    print("\nSaved CSVs into outputs/: courses.csv, students.csv, enrollments.csv, course_enrollment_counts.csv")
+    print("\nSaved CSVs (+ Parquet copies) into outputs/: courses.csv, students.csv, enrollments.csv, course_enrollment_counts.csv")
@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import math
 import string
 
+from data_io import read_table, write_table
+
 OUTPUT_DIR = Path("outputs")
 
 MAX_CAP = 70
@@ -18,7 +21,7 @@ def section_course(course_id: str, student_ids: list[str]):
     """
     Returns:
       sections_rows: list[dict]
-      section_enroll_rows: list[dict]
+      section_enroll_df: DataFrame[section_id, student_id]
     """
     N = len(student_ids)
 
@@ -51,44 +54,38 @@ def section_course(course_id: str, student_ids: list[str]):
     student_ids_sorted = sorted([str(s).strip() for s in student_ids])
 
     labels = make_section_labels(k)
-    sections_rows = []
-    section_enroll_rows = []
+    section_ids = [f"{course_id}_{label}" for label in labels]
 
-    idx = 0
-    for label, size in zip(labels, sizes):
-        section_id = f"{course_id}_{label}"
-        sections_rows.append({
+    sections_rows = [
+        {
             "section_id": section_id,
             "course_id": course_id,
             "section_label": label,
             "size": size
-        })
-
-        chunk = student_ids_sorted[idx: idx + size]
-        for sid in chunk:
-            section_enroll_rows.append({
-                "section_id": section_id,
-                "student_id": sid
-            })
+        }
+        for section_id, label, size in zip(section_ids, labels, sizes)
+    ]
 
-        idx += size
+    # Consecutive chunks of the sorted roster: section i gets the next sizes[i] students
+    section_enroll_df = pd.DataFrame({
+        "section_id": np.repeat(section_ids, sizes),
+        "student_id": student_ids_sorted,
+    })
 
-    return sections_rows, section_enroll_rows
+    return sections_rows, section_enroll_df
 
 def generate_sections():
     enrollments_path = OUTPUT_DIR / "enrollments.csv"
     if not enrollments_path.exists():
         raise FileNotFoundError("Missing outputs/enrollments.csv. Run 01_load_data.py first.")
 
-    enrollments_df = pd.read_csv(enrollments_path)
-    enrollments_df["student_id"] = enrollments_df["student_id"].astype(str).str.strip()
-    enrollments_df["course_id"] = enrollments_df["course_id"].astype(str).str.strip()
+    enrollments_df = read_table(enrollments_path, ["student_id", "course_id"])
 
     # Unique enrollments
-    enrollments_df = enrollments_df.drop_duplicates(["course_id", "student_id"])
+    enrollments_df = enrollments_df.drop_duplicates(subset=["course_id", "student_id"], keep="first", ignore_index=True)
 
     sections_rows_all = []
-    section_enroll_rows_all = []
+    section_enroll_chunks = []
 
     counts = (
         enrollments_df.groupby("course_id")["student_id"]
@@ -97,21 +94,24 @@ def generate_sections():
         .reset_index(name="enrolled")
     )
 
+    # Student lists per course in one pass (instead of a mask per course)
+    by_course = enrollments_df.groupby("course_id", sort=False)["student_id"].agg(list).to_dict()
+
     # Build sections for each course
-    for _, row in counts.iterrows():
-        course_id = row["course_id"]
-        student_ids = enrollments_df[enrollments_df["course_id"] == course_id]["student_id"].tolist()
+    for course_id in counts["course_id"].to_numpy():
+        student_ids = by_course[course_id]
 
-        sec_rows, sec_enroll_rows = section_course(course_id, student_ids)
+        sec_rows, sec_enroll_df = section_course(course_id, student_ids)
         sections_rows_all.extend(sec_rows)
-        section_enroll_rows_all.extend(sec_enroll_rows)
+        section_enroll_chunks.append(sec_enroll_df)
 
     sections_df = pd.DataFrame(sections_rows_all)
-    section_enrollments_df = pd.DataFrame(section_enroll_rows_all)
+    sections_df["section_label"] = pd.Categorical(sections_df["section_label"], categories=make_section_labels(26))
+    section_enrollments_df = pd.concat(section_enroll_chunks, ignore_index=True)
 
     # Save
-    sections_df.to_csv(OUTPUT_DIR / "sections.csv", index=False)
-    section_enrollments_df.to_csv(OUTPUT_DIR / "section_enrollments.csv", index=False)
+    write_table(sections_df, OUTPUT_DIR / "sections.csv")
+    write_table(section_enrollments_df, OUTPUT_DIR / "section_enrollments.csv")
 
     # Summary prints
     print("\n✅ Sectioning complete")
@@ -1,13 +1,21 @@
+import numpy as np
 import pandas as pd
 import math
+import os
 from pathlib import Path
+from joblib import Parallel, delayed
 from ortools.sat.python import cp_model
 
+from data_io import read_table, write_table
+
 OUTPUT_DIR = Path("outputs")
 
 MAX_CAP = 70
 MIN_CAP = 25
 
+# Solve each split with the per-course CP-SAT model instead of the closed form
+USE_CP_SAT = False
+
 def make_global_bucket(students: list[str]) -> dict[str, int]:
     """
     Deterministic A/B identity:
@@ -71,7 +79,7 @@ def solve_ab_assignment(student_ids: list[str], bucket: dict[str, int], course_i
 
     solver = cp_model.CpSolver()
     solver.parameters.max_time_in_seconds = 5.0
-    solver.parameters.num_search_workers = 8
+    solver.parameters.num_search_workers = 1  # courses are solved in parallel processes instead
 
     status = solver.Solve(model)
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
@@ -80,14 +88,41 @@ def solve_ab_assignment(student_ids: list[str], bucket: dict[str, int], course_i
     assign = {sid: int(solver.Value(y[sid])) for sid in student_ids}  # 0=A,1=B
     return assign, 2
 
+def greedy_ab_assignment(student_ids: list[str], bucket: dict[str, int], course_id: str):
+    """
+    Closed-form optimum of the model in solve_ab_assignment:
+    keep bucket-0 students in A and bucket-1 students in B, and move only
+    as many students across as the MIN_CAP/MAX_CAP bounds force.
+    """
+    N = len(student_ids)
+    if N <= MAX_CAP:
+        # no split needed
+        return {sid: 0 for sid in student_ids}, 1
+
+    k = math.ceil(N / MAX_CAP)
+    if k != 2:
+        raise ValueError(f"{course_id}: Expected 2 sections, got k={k} for N={N}. Extend model if needed.")
+
+    # Feasible range for |A| given both sides must stay within bounds
+    lo = max(MIN_CAP, N - MAX_CAP)
+    hi = min(MAX_CAP, N - MIN_CAP)
+    if lo > hi:
+        raise RuntimeError(f"{course_id}: No feasible A/B assignment found. N={N}")
+
+    n_bucket_a = sum(1 for sid in student_ids if bucket[sid] == 0)
+    size_a = min(max(n_bucket_a, lo), hi)
+
+    # Bucket-0 students first, so the first size_a go to A with the fewest mismatches
+    ordered = sorted(student_ids, key=lambda sid: (bucket[sid], sid))
+    assign = {sid: (0 if i < size_a else 1) for i, sid in enumerate(ordered)}  # 0=A,1=B
+    return assign, 2
+
 def build_sections_ilp():
     enroll_path = OUTPUT_DIR / "enrollments.csv"
     if not enroll_path.exists():
         raise FileNotFoundError("outputs/enrollments.csv missing. Run 01_load_data.py first.")
 
-    enroll = pd.read_csv(enroll_path)
-    enroll["course_id"] = enroll["course_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
+    enroll = read_table(enroll_path, ["course_id", "student_id"])
     enroll = enroll.drop_duplicates(["course_id", "student_id"])
 
     all_students = enroll["student_id"].unique().tolist()
@@ -95,21 +130,29 @@ def build_sections_ilp():
 
     course_counts = enroll.groupby("course_id")["student_id"].nunique().sort_values(ascending=False)
 
+    # Student lists per course in one pass (enroll is already unique per course/student)
+    by_course = enroll.groupby("course_id", sort=False)["student_id"].agg(list).to_dict()
+
     sections_rows = []
-    section_enroll_rows = []
+    section_enroll_chunks = []
 
-    for course_id, N in course_counts.items():
-        studs = enroll.loc[enroll["course_id"] == course_id, "student_id"].unique().tolist()
+    # Solve assignments; the per-course CP-SAT solves are independent, so fan them out across cores
+    if USE_CP_SAT:
+        results = Parallel(n_jobs=os.cpu_count(), backend="loky")(
+            delayed(solve_ab_assignment)(by_course[course_id], bucket, course_id)
+            for course_id in course_counts.index
+        )
+    else:
+        results = [greedy_ab_assignment(by_course[course_id], bucket, course_id) for course_id in course_counts.index]
 
-        # Solve assignment
-        assignment, k = solve_ab_assignment(studs, bucket, course_id)
+    for (course_id, N), (assignment, k) in zip(course_counts.items(), results):
+        studs = by_course[course_id]
 
         if k == 1:
             # single section
             sec_id = f"{course_id}_A"
             sections_rows.append({"section_id": sec_id, "course_id": course_id, "section_label": "A", "size": N})
-            for sid in studs:
-                section_enroll_rows.append({"section_id": sec_id, "student_id": sid})
+            section_enroll_chunks.append(pd.DataFrame({"section_id": sec_id, "student_id": studs}))
         else:
             # two sections A/B
             A = [sid for sid in studs if assignment[sid] == 0]
@@ -125,17 +168,19 @@ def build_sections_ilp():
             sections_rows.append({"section_id": secA, "course_id": course_id, "section_label": "A", "size": len(A)})
             sections_rows.append({"section_id": secB, "course_id": course_id, "section_label": "B", "size": len(B)})
 
-            for sid in A:
-                section_enroll_rows.append({"section_id": secA, "student_id": sid})
-            for sid in B:
-                section_enroll_rows.append({"section_id": secB, "student_id": sid})
+            section_enroll_chunks.append(pd.DataFrame({
+                "section_id": np.repeat([secA, secB], [len(A), len(B)]),
+                "student_id": A + B,
+            }))
 
-    sections_df = pd.DataFrame(sections_rows).sort_values(["course_id", "section_label"]).reset_index(drop=True)
-    section_enroll_df = pd.DataFrame(section_enroll_rows).drop_duplicates().reset_index(drop=True)
+    sections_df = pd.DataFrame(sections_rows)
+    sections_df["section_label"] = pd.Categorical(sections_df["section_label"], categories=["A", "B"])
+    sections_df = sections_df.sort_values(["course_id", "section_label"]).reset_index(drop=True)
+    section_enroll_df = pd.concat(section_enroll_chunks, ignore_index=True).drop_duplicates(ignore_index=True)
 
     # Save
-    sections_df.to_csv(OUTPUT_DIR / "sections.csv", index=False)
-    section_enroll_df.to_csv(OUTPUT_DIR / "section_enrollments.csv", index=False)
+    write_table(sections_df, OUTPUT_DIR / "sections.csv")
+    write_table(section_enroll_df, OUTPUT_DIR / "section_enrollments.csv")
 
     print("\n✅ ILP student-aware sectioning complete")
     print("Courses:", sections_df["course_id"].nunique())
@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from data_io import write_table
+
 OUTPUT_DIR = Path("outputs")
 
 WEEKS = range(1, 11)
@@ -29,42 +32,31 @@ DAYS_SUN = ["Sun"]
 ROOMS_W1_4 = 10
 ROOMS_W5_10 = 4
 
-def room_cap(week: int) -> int:
-    return ROOMS_W1_4 if week <= 4 else ROOMS_W5_10
+def day_block(days: list[str], day_slots: list[tuple[str, str, str]], is_sunday: int) -> pd.DataFrame:
+    """All (week, day, slot) combinations for one set of days, built column-wise."""
+    n_days, n_slots = len(days), len(day_slots)
+    weeks = np.repeat(np.array(WEEKS), n_days * n_slots)
+    day = np.tile(np.repeat(days, n_slots), len(WEEKS))
+    codes, starts, ends = (np.tile(col, len(WEEKS) * n_days) for col in zip(*day_slots))
 
-def build_slots():
-    rows = []
-    for week in WEEKS:
-        # Mon–Sat
-        for day in DAYS_MON_SAT:
-            for slot_code, start, end in WEEKDAY_SLOTS:
-                rows.append({
-                    "slot_id": f"W{week}_{day}_{slot_code}",
-                    "week": week,
-                    "day": day,
-                    "slot_code": slot_code,
-                    "start": start,
-                    "end": end,
-                    "room_capacity": room_cap(week),
-                    "is_sunday": 0
-                })
-        # Sunday
-        for day in DAYS_SUN:
-            for slot_code, start, end in SUNDAY_SLOTS:
-                rows.append({
-                    "slot_id": f"W{week}_{day}_{slot_code}",
-                    "week": week,
-                    "day": day,
-                    "slot_code": slot_code,
-                    "start": start,
-                    "end": end,
-                    "room_capacity": room_cap(week),
-                    "is_sunday": 1
-                })
+    df = pd.DataFrame({
+        "week": weeks,
+        "day": day,
+        "slot_code": codes,
+        "start": starts,
+        "end": ends,
+        "room_capacity": np.where(weeks <= 4, ROOMS_W1_4, ROOMS_W5_10),
+        "is_sunday": is_sunday,
+    })
+    df.insert(0, "slot_id", "W" + df["week"].astype(str) + "_" + df["day"] + "_" + df["slot_code"])
+    return df
 
-    df = pd.DataFrame(rows)
+def build_slots():
+    # Mon–Sat then Sunday within each week, same row order as the old nested loops
+    df = pd.concat([day_block(DAYS_MON_SAT, WEEKDAY_SLOTS, 0), day_block(DAYS_SUN, SUNDAY_SLOTS, 1)])
+    df = df.sort_values("week", kind="stable").reset_index(drop=True)
     OUTPUT_DIR.mkdir(exist_ok=True)
-    df.to_csv(OUTPUT_DIR / "slots.csv", index=False)
+    write_table(df, OUTPUT_DIR / "slots.csv")
 
     print("\n✅ slots.csv rebuilt (PAN-IIM shock ON)")
     print("Total slots:", len(df))
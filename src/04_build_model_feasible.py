@@ -1,8 +1,11 @@
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from data_io import read_table
+
 OUTPUT_DIR = Path("outputs")
 
 MIN_SESSIONS = 19   # 🔥 changed from 20
@@ -10,20 +13,59 @@ TIME_LIMIT = 120
 WORKERS = 8
 
 
+def greedy_schedule(section_ids, slot_ids, faculty_to_sections, student_to_sections, slot_capacity, sessions):
+    """
+    Earliest-fit schedule used as a CP-SAT hint.
+
+    Sections of the busiest faculty go first; each takes the earliest
+    slots where a room is left and none of its students or its faculty
+    is already busy. Each section's resources (one bit per student, then
+    one per faculty) are packed into a row of uint64 words, so a clash
+    test is a word-wise AND over n_bits/64 words.
+    Returns the set of (section index, slot index) pairs chosen.
+    """
+    sec_idx = {sec: i for i, sec in enumerate(section_ids)}
+    n_students = len(student_to_sections)
+    n_bits = n_students + len(faculty_to_sections)
+    words = (n_bits + 63) // 64
+
+    bits = np.zeros((len(section_ids), words * 64), dtype=bool)
+    for k, secs in enumerate(student_to_sections.values()):
+        bits[[sec_idx[sec] for sec in secs], k] = True
+
+    fac_load = {}
+    for f, (fac, secs) in enumerate(faculty_to_sections.items()):
+        bits[[sec_idx[sec] for sec in secs], n_students + f] = True
+        for sec in secs:
+            fac_load[sec] = len(secs)
+
+    sec_mask = np.packbits(bits, axis=1, bitorder="little").view(np.uint64)  # (n_sections, words)
+    slot_busy = np.zeros((len(slot_ids), words), dtype=np.uint64)
+    rooms_left = [int(slot_capacity[sl]) for sl in slot_ids]
+
+    chosen = set()
+    for sec in sorted(section_ids, key=lambda s: -fac_load[s]):
+        i = sec_idx[sec]
+        placed = 0
+        for j in range(len(slot_ids)):
+            if placed == sessions:
+                break
+            if rooms_left[j] > 0 and not np.bitwise_and(slot_busy[j], sec_mask[i]).any():
+                slot_busy[j] |= sec_mask[i]
+                rooms_left[j] -= 1
+                chosen.add((i, j))
+                placed += 1
+    return chosen
+
+
 def main():
     print("\nLoading data...")
 
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
-
-    # Normalize
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    enroll["section_id"] = enroll["section_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    slots["slot_id"] = slots["slot_id"].astype(str).str.strip()
+    sections = read_table(OUTPUT_DIR / "sections.csv", ["section_id", "course_id"])
+    enroll = read_table(OUTPUT_DIR / "section_enrollments.csv", ["section_id", "student_id"])
+    courses = read_table(OUTPUT_DIR / "courses.csv", ["course_id", "faculty_raw"])
+    slots = read_table(OUTPUT_DIR / "slots.csv", ["slot_id"])
+
     slots["room_capacity"] = slots["room_capacity"].astype(int)
 
     section_ids = sections["section_id"].unique().tolist()
@@ -33,7 +75,6 @@ def main():
     print("Slots:", len(slot_ids))
 
     # ---- Build mappings ----
-    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
 
     # Faculty mapping
     faculty_col = None
@@ -44,24 +85,24 @@ def main():
     if faculty_col is None:
         raise ValueError("No faculty column found in courses.csv")
 
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses[faculty_col] = courses[faculty_col].astype(str).str.strip()
-
     course_to_faculty = dict(zip(courses["course_id"], courses[faculty_col]))
 
     # Student → sections
     student_to_sections = (
-        enroll.groupby("student_id")["section_id"]
-        .apply(list)
+        enroll.groupby("student_id", sort=False)["section_id"]
+        .agg(list)
         .to_dict()
     )
 
-    # Faculty → sections
-    faculty_to_sections = {}
-    for sec in section_ids:
-        cid = sec_to_course[sec]
-        fac = course_to_faculty[cid]
-        faculty_to_sections.setdefault(fac, []).append(sec)
+    # Faculty → sections: integer faculty code per section, then one grouping pass
+    sec_fac = sections.drop_duplicates("section_id")["course_id"].map(course_to_faculty)
+    if sec_fac.isna().any():
+        raise ValueError("Sections found for courses missing from courses.csv")
+    fac_codes, fac_names = pd.factorize(sec_fac)
+    faculty_to_sections = {
+        fac_names[code]: secs
+        for code, secs in pd.Series(section_ids).groupby(fac_codes, sort=False).agg(list).items()
+    }
 
     # Slot → capacity
     slot_capacity = dict(zip(slots["slot_id"], slots["room_capacity"]))
@@ -70,31 +111,41 @@ def main():
     print("\nBuilding CP-SAT model...")
     model = cp_model.CpModel()
 
-    x = {}
-    for sec in section_ids:
-        for sl in slot_ids:
-            x[(sec, sl)] = model.NewBoolVar(f"x_{sec}_{sl}")
+    # X[i, j] = section i meets in slot j (unnamed vars: no per-var f-string)
+    sec_idx = {sec: i for i, sec in enumerate(section_ids)}
+    X = np.empty((len(section_ids), len(slot_ids)), dtype=object)
+    X.flat[:] = [model.NewBoolVar("") for _ in range(X.size)]
 
     # 1️⃣ At least 10 sessions per section
-    for sec in section_ids:
-        model.Add(sum(x[(sec, sl)] for sl in slot_ids) >= MIN_SESSIONS)
+    for i in range(len(section_ids)):
+        model.Add(cp_model.LinearExpr.Sum(X[i, :].tolist()) >= MIN_SESSIONS)
 
     # 2️⃣ Room capacity
-    for sl in slot_ids:
+    for j, sl in enumerate(slot_ids):
         cap = int(slot_capacity[sl])
-        model.Add(sum(x[(sec, sl)] for sec in section_ids) <= cap)
+        model.Add(cp_model.LinearExpr.Sum(X[:, j].tolist()) <= cap)
 
     # 3️⃣ Faculty conflict
     for fac, secs in faculty_to_sections.items():
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
-
-    # 4️⃣ Student conflict
-    for student, secs in student_to_sections.items():
         if len(secs) <= 1:
             continue
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
+        rows = X[[sec_idx[sec] for sec in secs], :]
+        for j in range(len(slot_ids)):
+            model.AddAtMostOne(rows[:, j].tolist())
+
+    # 4️⃣ Student conflict (students with the same section bundle share one constraint)
+    student_bundles = {tuple(sorted(set(secs))) for secs in student_to_sections.values() if len(set(secs)) > 1}
+    for secs in sorted(student_bundles):
+        rows = X[[sec_idx[sec] for sec in secs], :]
+        for j in range(len(slot_ids)):
+            model.AddAtMostOne(rows[:, j].tolist())
+
+    # Warm start: hint the earliest-fit greedy schedule
+    hint = greedy_schedule(section_ids, slot_ids, faculty_to_sections, student_to_sections, slot_capacity, MIN_SESSIONS)
+    print("Greedy hint sessions:", len(hint), "/", len(section_ids) * MIN_SESSIONS)
+    for i in range(len(section_ids)):
+        for j in range(len(slot_ids)):
+            model.AddHint(X[i, j], int((i, j) in hint))
 
     # No objective — pure feasibility
     solver = cp_model.CpSolver()
@@ -114,8 +165,8 @@ def main():
 
     # ---- Extract summary ----
     print("\nSessions scheduled per section:")
-    for sec in section_ids[:10]:
-        count = sum(solver.Value(x[(sec, sl)]) for sl in slot_ids)
+    for i, sec in enumerate(section_ids[:10]):
+        count = sum(solver.Value(v) for v in X[i, :])
         print(sec, "→", count)
 
     print("\nDone.")
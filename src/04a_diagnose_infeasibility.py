@@ -1,17 +1,22 @@
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from scipy import sparse
+
+from data_io import read_table
 
 OUTPUT_DIR = Path("outputs")
 SESSIONS_PER_SECTION = 20
 SLOTS_PER_WEEK = 40
 WEEKS = 10
 MAX_SESSIONS_PER_STUDENT = SLOTS_PER_WEEK * WEEKS  # 400
+TOP_OVERLAPS = 20
 
 def main():
-    section_enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
+    section_enroll = read_table(OUTPUT_DIR / "section_enrollments.csv", ["section_id", "student_id"])
+    sections = read_table(OUTPUT_DIR / "sections.csv", ["section_id", "course_id"])
+    courses = read_table(OUTPUT_DIR / "courses.csv", ["course_id"])
+    slots = read_table(OUTPUT_DIR / "slots.csv", ["slot_id"])
 
     # Student -> number of sections enrolled
     stud_sec_counts = section_enroll.groupby("student_id")["section_id"].nunique().sort_values(ascending=False)
@@ -54,5 +59,27 @@ def main():
     print("\nLargest sections:")
     print(sec_sizes.head(10).to_string())
 
+    # Pairwise overlap: shared students for every section pair that can never share a slot.
+    # A is the student x section incidence matrix, so A.T @ A counts shared students per pair.
+    stu_codes, stu_names = pd.factorize(section_enroll["student_id"])
+    sec_codes, sec_names = pd.factorize(section_enroll["section_id"])
+    A = sparse.csr_matrix(
+        (np.ones(len(section_enroll), dtype=np.int32), (stu_codes, sec_codes)),
+        shape=(len(stu_names), len(sec_names)),
+    )
+    overlap = (A.T @ A).tocoo()
+    upper = overlap.row < overlap.col
+    pairs = pd.DataFrame({
+        "section_a": sec_names[overlap.row[upper]],
+        "section_b": sec_names[overlap.col[upper]],
+        "shared_students": overlap.data[upper],
+    }).sort_values(["shared_students", "section_a", "section_b"], ascending=[False, True, True])
+
+    n_pairs = len(sec_names) * (len(sec_names) - 1) // 2
+    print("\n=== SECTION CONFLICT DENSITY ===")
+    print(f"Conflicting section pairs: {len(pairs)} / {n_pairs} ({len(pairs) / max(n_pairs, 1):.1%})")
+    print(f"\nTop {TOP_OVERLAPS} overlapping section pairs:")
+    print(pairs.head(TOP_OVERLAPS).to_string(index=False))
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,9 @@
-import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 from pathlib import Path
 
+from data_io import fresh_parquet, read_table
+
 OUTPUT_DIR = Path("outputs")
 
 def main():
@@ -17,8 +20,7 @@ def main():
         print("❌ section_enrollments.csv NOT found")
         return
 
-    sections = pd.read_csv(sections_path)
-    enroll = pd.read_csv(enroll_path)
+    sections = read_table(sections_path, ["section_id", "course_id"])
 
     print("\nSections file loaded from:", sections_path.resolve())
     print("Total sections:", len(sections))
@@ -36,8 +38,19 @@ def main():
     print("\nFirst 5 sections:")
     print(sections.head())
 
-    print("\nTotal section enrollments:", len(enroll))
-    print("Unique students:", enroll["student_id"].nunique())
+    # Enrollment aggregates straight off the Parquet copy when there is one
+    enroll_pq = fresh_parquet(enroll_path)
+    if enroll_pq is not None:
+        enroll_ds = ds.dataset(enroll_pq, format="parquet")
+        n_enroll = enroll_ds.count_rows()
+        n_students = pc.count_distinct(enroll_ds.to_table(columns=["student_id"]).column("student_id")).as_py()
+    else:
+        enroll = read_table(enroll_path, ["section_id", "student_id"])
+        n_enroll = len(enroll)
+        n_students = enroll["student_id"].nunique()
+
+    print("\nTotal section enrollments:", n_enroll)
+    print("Unique students:", n_students)
 
     print("\n=== END VERIFY ===\n")
 
@@ -1,17 +1,23 @@
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
 
+from data_io import read_arrow_table, write_arrow_table
+
 OUTPUT_DIR = Path("outputs")
 
 def main():
     path = OUTPUT_DIR / "slots.csv"
-    df = pd.read_csv(path)
+    tbl = read_arrow_table(path, ["slot_id"])
 
-    df["room_capacity"] = 10
-    df.to_csv(path, index=False)
+    # Overwrite the one column in place; no pandas round-trip
+    col = tbl.schema.get_field_index("room_capacity")
+    tbl = tbl.set_column(col, "room_capacity", pa.array(np.full(tbl.num_rows, 10, dtype=np.int64)))
+    write_arrow_table(tbl, path)
 
     print("✅ Patched slots.csv: room_capacity set to 10 for all weeks.")
-    print("Unique capacities now:", sorted(df["room_capacity"].unique().tolist()))
+    print("Unique capacities now:", sorted(pc.unique(tbl.column("room_capacity")).to_pylist()))
 
 if __name__ == "__main__":
     main()
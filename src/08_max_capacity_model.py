@@ -1,8 +1,9 @@
 
-import pandas as pd
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from data_io import read_table
+
 OUTPUT_DIR = Path("outputs")
 
 TIME_LIMIT = 60
@@ -12,16 +13,11 @@ WORKERS = 8
 def main():
     print("\nLoading data...")
 
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
+    sections = read_table(OUTPUT_DIR / "sections.csv", ["section_id", "course_id"])
+    enroll = read_table(OUTPUT_DIR / "section_enrollments.csv", ["section_id", "student_id"])
+    courses = read_table(OUTPUT_DIR / "courses.csv", ["course_id", "faculty_raw"])
+    slots = read_table(OUTPUT_DIR / "slots.csv", ["slot_id"])
 
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    enroll["section_id"] = enroll["section_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    slots["slot_id"] = slots["slot_id"].astype(str).str.strip()
     slots["room_capacity"] = slots["room_capacity"].astype(int)
 
     section_ids = sections["section_id"].unique().tolist()
@@ -41,9 +37,6 @@ def main():
     if faculty_col is None:
         raise ValueError("No faculty column found")
 
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses[faculty_col] = courses[faculty_col].astype(str).str.strip()
-
     course_to_faculty = dict(zip(courses["course_id"], courses[faculty_col]))
 
     # Student → sections
@@ -73,22 +66,23 @@ def main():
     # Room capacity
     for sl in slot_ids:
         cap = int(slot_capacity[sl])
-        model.Add(sum(x[(sec, sl)] for sec in section_ids) <= cap)
+        model.Add(cp_model.LinearExpr.Sum([x[(sec, sl)] for sec in section_ids]) <= cap)
 
     # Faculty conflict
     for fac, secs in faculty_to_sections.items():
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
-
-    # Student conflict
-    for student, secs in student_to_sections.items():
         if len(secs) <= 1:
             continue
         for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
+            model.AddAtMostOne([x[(sec, sl)] for sec in secs])
+
+    # Student conflict (students with the same section bundle share one constraint)
+    student_bundles = {tuple(sorted(set(secs))) for secs in student_to_sections.values() if len(set(secs)) > 1}
+    for secs in sorted(student_bundles):
+        for sl in slot_ids:
+            model.AddAtMostOne([x[(sec, sl)] for sec in secs])
 
     # Maximize total sessions
-    total_sessions = sum(x[(sec, sl)] for sec in section_ids for sl in slot_ids)
+    total_sessions = cp_model.LinearExpr.Sum(list(x.values()))
     model.Maximize(total_sessions)
 
     solver = cp_model.CpSolver()
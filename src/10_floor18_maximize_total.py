@@ -2,6 +2,8 @@ import pandas as pd
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from data_io import load_inputs
+
 OUTPUT_DIR = Path("outputs")
 
 FLOOR = 18
@@ -14,53 +16,13 @@ WORKERS = 8
 def main():
     print("\nLoading data...")
 
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
-
-    # Normalize
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    enroll["section_id"] = enroll["section_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    slots["slot_id"] = slots["slot_id"].astype(str).str.strip()
-    slots["room_capacity"] = slots["room_capacity"].astype(int)
-
-    section_ids = sections["section_id"].unique().tolist()
-    slot_ids = slots["slot_id"].unique().tolist()
-
-    # section -> course
-    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
-
-    # faculty column detect
-    faculty_col = None
-    for col in ["faculty_raw", "faculty", "faculty_name"]:
-        if col in courses.columns:
-            faculty_col = col
-            break
-    if faculty_col is None:
-        raise ValueError("No faculty column found in courses.csv")
-
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses[faculty_col] = courses[faculty_col].astype(str).str.strip()
-    course_to_faculty = dict(zip(courses["course_id"], courses[faculty_col]))
-
-    # student -> sections
-    student_to_sections = (
-        enroll.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
-
-    # faculty -> sections
-    faculty_to_sections = {}
-    for sec in section_ids:
-        fac = course_to_faculty[sec_to_course[sec]]
-        faculty_to_sections.setdefault(fac, []).append(sec)
-
-    # slot -> capacity
-    slot_capacity = dict(zip(slots["slot_id"], slots["room_capacity"]))
+    ctx = load_inputs(OUTPUT_DIR)
+    section_ids = ctx.section_ids
+    slot_ids = ctx.slot_ids
+    sec_to_course = ctx.sec_to_course
+    student_to_sections = ctx.student_to_sections
+    faculty_to_sections = ctx.faculty_to_sections
+    slot_capacity = ctx.slot_capacity
 
     print("\nBuilding model...")
     model = cp_model.CpModel()
@@ -1,8 +1,13 @@
-
+import numpy as np
 import pandas as pd
+import sys
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from base_model import add_hint, build_base_model, maybe_break_symmetry, solution_matrix
+from data_io import load_inputs
+from solver_config import configure_solver, pick_workers, solve_to_bound, write_solve_stats
+
 OUTPUT_DIR = Path("outputs")
 
 FLOOR = 18
@@ -11,115 +16,57 @@ CEIL = 20
 MAX_PER_WEEK = 2  # 🔥 key improvement
 
 TIME_LIMIT = 240
-WORKERS = 8
-
-def main():
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
-
-    # Normalize
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    enroll["section_id"] = enroll["section_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    slots["slot_id"] = slots["slot_id"].astype(str).str.strip()
-    slots["week"] = slots["week"].astype(int)
-    slots["day"] = slots["day"].astype(str).str.strip()
-    slots["room_capacity"] = slots["room_capacity"].astype(int)
-
-    section_ids = sections["section_id"].unique().tolist()
-    slot_ids = slots["slot_id"].unique().tolist()
-    weeks = sorted(slots["week"].unique().tolist())
-
-    # section -> course
-    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
-
-    # faculty column detect
-    faculty_col = None
-    for col in ["faculty_raw", "faculty", "faculty_name"]:
-        if col in courses.columns:
-            faculty_col = col
-            break
-    if faculty_col is None:
-        raise ValueError("No faculty column found in courses.csv")
-
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses[faculty_col] = courses[faculty_col].astype(str).str.strip()
-    course_to_faculty = dict(zip(courses["course_id"], courses[faculty_col]))
-
-    # student -> sections
-    student_to_sections = (
-        enroll.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
-
-    # faculty -> sections
-    faculty_to_sections = {}
-    for sec in section_ids:
-        fac = course_to_faculty[sec_to_course[sec]]
-        faculty_to_sections.setdefault(fac, []).append(sec)
 
-    # slot -> capacity
-    slot_capacity = dict(zip(slots["slot_id"], slots["room_capacity"]))
+# Warm start from 13's cap-only solution (run with --no-hint to solve cold)
+HINT_NAME = "max_total_cap20"
 
-    # slots by week
-    slots_by_week = {w: slots.loc[slots["week"] == w, "slot_id"].tolist() for w in weeks}
+def main():
+    ctx = load_inputs(OUTPUT_DIR)
+    section_ids = ctx.section_ids
+    slot_ids = ctx.slot_ids
+    weeks = ctx.weeks
+    sec_to_course = ctx.sec_to_course
+    slots_by_week = ctx.slots_by_week
 
     # -------- Model --------
-    model = cp_model.CpModel()
-
-    x = {(sec, sl): model.NewBoolVar(f"x_{sec}_{sl}") for sec in section_ids for sl in slot_ids}
-
-    # Room capacity
-    for sl in slot_ids:
-        model.Add(sum(x[(sec, sl)] for sec in section_ids) <= int(slot_capacity[sl]))
-
-    # Faculty conflict
-    for fac, secs in faculty_to_sections.items():
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
-
-    # Student conflict
-    for student, secs in student_to_sections.items():
-        if len(secs) <= 1:
-            continue
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
+    # X, room capacity, student and faculty conflicts
+    model, X, _ = build_base_model(ctx)
 
     # Per-section sessions with floor/ceiling
-    sec_sessions = {}
-    for sec in section_ids:
-        tot = model.NewIntVar(0, len(slot_ids), f"sessions_{sec}")
-        model.Add(tot == sum(x[(sec, sl)] for sl in slot_ids))
-        model.Add(tot >= FLOOR)
-        model.Add(tot <= CEIL)
-        sec_sessions[sec] = tot
+    for i in range(len(section_ids)):
+        model.AddLinearConstraint(cp_model.LinearExpr.Sum(X[i, :].tolist()), FLOOR, CEIL)
 
     # 🔥 Weekly cap: at most 2 sessions per week per section
-    for sec in section_ids:
+    slot_idx = {sl: j for j, sl in enumerate(slot_ids)}
+    week_cols = {w: [slot_idx[sl] for sl in slots_by_week[w]] for w in weeks}
+    for i in range(len(section_ids)):
         for w in weeks:
-            model.Add(sum(x[(sec, sl)] for sl in slots_by_week[w]) <= MAX_PER_WEEK)
+            model.Add(cp_model.LinearExpr.Sum(X[i, week_cols[w]].tolist()) <= MAX_PER_WEEK)
 
     # Objective: maximize total sessions (after guaranteeing floor)
-    total_sessions = model.NewIntVar(0, len(section_ids) * CEIL, "total_sessions")
-    model.Add(total_sessions == sum(sec_sessions[sec] for sec in section_ids))
+    total_sessions = cp_model.LinearExpr.Sum(X.ravel().tolist())
     model.Maximize(total_sessions)
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = TIME_LIMIT
-    solver.parameters.num_search_workers = WORKERS
+    maybe_break_symmetry(model, X, ctx)
+
+    if "--no-hint" not in sys.argv:
+        add_hint(model, X, OUTPUT_DIR, HINT_NAME, section_ids, slot_ids)
+
+    solver = configure_solver(cp_model.CpSolver(), workers=pick_workers(X.size), time_limit=TIME_LIMIT)
 
     print("\nSolving (floor=18, cap=20, weekly<=2, maximize total)...")
-    status = solver.Solve(model)
+    status = solve_to_bound(solver, model, len(section_ids) * CEIL)
+    write_solve_stats(solver, OUTPUT_DIR, Path(__file__).stem)
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         print("\n❌ No solution found.")
         print("Status:", solver.StatusName(status))
         return
 
+    # Per-section session counts, from one batch read of the X values
+    session_counts = solution_matrix(solver, X).sum(axis=1)
+    sec_sessions = dict(zip(section_ids, session_counts.tolist()))
+
     print("\n✅ Solution found.")
     print("Status:", solver.StatusName(status))
 
@@ -128,11 +75,8 @@ def main():
     print("Average per section:", round(total_val / len(section_ids), 2))
 
     # Distribution
-    dist = {18: 0, 19: 0, 20: 0}
-    for sec in section_ids:
-        v = solver.Value(sec_sessions[sec])
-        if v in dist:
-            dist[v] += 1
+    by_count = np.bincount(session_counts, minlength=21)
+    dist = {k: int(by_count[k]) for k in (18, 19, 20)}
     print("\nSection session distribution:")
     for k in sorted(dist):
         print(f"{k} sessions:", dist[k])
@@ -143,7 +87,7 @@ def main():
         out_rows.append({
             "section_id": sec,
             "course_id": sec_to_course[sec],
-            "sessions_scheduled": solver.Value(sec_sessions[sec]),
+            "sessions_scheduled": sec_sessions[sec],
         })
     summary_df = pd.DataFrame(out_rows).sort_values(["sessions_scheduled", "course_id", "section_id"], ascending=[False, True, True])
     out_path = OUTPUT_DIR / "section_sessions_floor18_weeklycap_max.csv"
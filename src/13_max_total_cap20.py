@@ -1,97 +1,42 @@
 
-import pandas as pd
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from base_model import build_base_model, maybe_break_symmetry, save_hint, solution_matrix
+from data_io import load_inputs
+from solver_config import configure_solver, pick_workers, solve_to_bound, write_solve_stats
+
 OUTPUT_DIR = Path("outputs")
 CAP = 20
 
 TIME_LIMIT = 240
-WORKERS = 8
+
+# Saved as outputs/hints/<HINT_NAME>.npz for the floor/facsplit variants to warm-start from
+HINT_NAME = "max_total_cap20"
 
 def main():
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
-
-    # Normalize
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    enroll["section_id"] = enroll["section_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    slots["slot_id"] = slots["slot_id"].astype(str).str.strip()
-    slots["room_capacity"] = slots["room_capacity"].astype(int)
-
-    section_ids = sections["section_id"].unique().tolist()
-    slot_ids = slots["slot_id"].unique().tolist()
-
-    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
-
-    # Faculty column detect
-    faculty_col = None
-    for col in ["faculty_raw", "faculty", "faculty_name"]:
-        if col in courses.columns:
-            faculty_col = col
-            break
-    if faculty_col is None:
-        raise ValueError("No faculty column found in courses.csv")
-
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses[faculty_col] = courses[faculty_col].astype(str).str.strip()
-    course_to_faculty = dict(zip(courses["course_id"], courses[faculty_col]))
-
-    student_to_sections = (
-        enroll.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
-
-    faculty_to_sections = {}
-    for sec in section_ids:
-        fac = course_to_faculty[sec_to_course[sec]]
-        faculty_to_sections.setdefault(fac, []).append(sec)
-
-    slot_capacity = dict(zip(slots["slot_id"], slots["room_capacity"]))
-
-    model = cp_model.CpModel()
-
-    x = {(sec, sl): model.NewBoolVar(f"x_{sec}_{sl}") for sec in section_ids for sl in slot_ids}
-
-    # Room capacity
-    for sl in slot_ids:
-        model.Add(sum(x[(sec, sl)] for sec in section_ids) <= int(slot_capacity[sl]))
-
-    # Faculty conflict
-    for fac, secs in faculty_to_sections.items():
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
-
-    # Student conflict
-    for student, secs in student_to_sections.items():
-        if len(secs) <= 1:
-            continue
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
+    ctx = load_inputs(OUTPUT_DIR)
+    section_ids = ctx.section_ids
+    slot_ids = ctx.slot_ids
+
+    # X, room capacity, student and faculty conflicts
+    model, X, _ = build_base_model(ctx)
 
     # Cap 20 per section
-    sec_sessions = {}
-    for sec in section_ids:
-        tot = model.NewIntVar(0, CAP, f"sessions_{sec}")
-        model.Add(tot == sum(x[(sec, sl)] for sl in slot_ids))
-        model.Add(tot <= CAP)
-        sec_sessions[sec] = tot
-
-    total_sessions = model.NewIntVar(0, len(section_ids) * CAP, "total_sessions")
-    model.Add(total_sessions == sum(sec_sessions[sec] for sec in section_ids))
+    for i in range(len(section_ids)):
+        row = cp_model.LinearExpr.Sum(X[i, :].tolist())
+        model.Add(row <= CAP)
+
+    total_sessions = cp_model.LinearExpr.Sum(X.ravel().tolist())
     model.Maximize(total_sessions)
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = TIME_LIMIT
-    solver.parameters.num_search_workers = WORKERS
+    maybe_break_symmetry(model, X, ctx)
+
+    solver = configure_solver(cp_model.CpSolver(), workers=pick_workers(X.size), time_limit=TIME_LIMIT)
 
     print("\nSolving (maximize total, cap=20, no floors)...")
-    status = solver.Solve(model)
+    status = solve_to_bound(solver, model, len(section_ids) * CAP)
+    write_solve_stats(solver, OUTPUT_DIR, Path(__file__).stem)
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         print("❌ No solution.")
@@ -101,6 +46,8 @@ def main():
     print("\n✅", solver.StatusName(status))
     print("Max total sessions:", solver.Value(total_sessions), "/ 940")
 
+    save_hint(OUTPUT_DIR, HINT_NAME, section_ids, slot_ids, solution_matrix(solver, X))
+
 if __name__ == "__main__":
     main()
 
@@ -1,93 +1,54 @@
 import pandas as pd
+import sys
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from base_model import add_hint, build_base_model, maybe_break_symmetry, solution_matrix
+from data_io import load_inputs
+from solver_config import configure_solver, pick_workers, solve_to_bound, write_solve_stats
+
 OUTPUT_DIR = Path("outputs")
 CAP = 20
 TIME_LIMIT = 240
-WORKERS = 8
-
-def main():
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
-
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    enroll["section_id"] = enroll["section_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    slots["slot_id"] = slots["slot_id"].astype(str).str.strip()
-    slots["room_capacity"] = slots["room_capacity"].astype(int)
-
-    section_ids = sections["section_id"].unique().tolist()
-    slot_ids = slots["slot_id"].unique().tolist()
-    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
-
-    # faculty column detect
-    faculty_col = None
-    for col in ["faculty_raw", "faculty", "faculty_name"]:
-        if col in courses.columns:
-            faculty_col = col
-            break
-    if faculty_col is None:
-        raise ValueError("No faculty column found in courses.csv")
-
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses[faculty_col] = courses[faculty_col].astype(str).str.strip()
-    course_to_faculty = dict(zip(courses["course_id"], courses[faculty_col]))
-
-    student_to_sections = (
-        enroll.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
-
-    faculty_to_sections = {}
-    for sec in section_ids:
-        fac = course_to_faculty[sec_to_course[sec]]
-        faculty_to_sections.setdefault(fac, []).append(sec)
-
-    slot_capacity = dict(zip(slots["slot_id"], slots["room_capacity"]))
-
-    model = cp_model.CpModel()
-    x = {(sec, sl): model.NewBoolVar(f"x_{sec}_{sl}") for sec in section_ids for sl in slot_ids}
 
-    # constraints
-    for sl in slot_ids:
-        model.Add(sum(x[(sec, sl)] for sec in section_ids) <= int(slot_capacity[sl]))
+# Warm start from 13's cap-only solution (run with --no-hint to solve cold)
+HINT_NAME = "max_total_cap20"
 
-    for fac, secs in faculty_to_sections.items():
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
+def main():
+    ctx = load_inputs(OUTPUT_DIR)
+    section_ids = ctx.section_ids
+    slot_ids = ctx.slot_ids
+    sec_to_course = ctx.sec_to_course
+    course_to_faculty = ctx.course_to_faculty
 
-    for student, secs in student_to_sections.items():
-        if len(secs) <= 1:
-            continue
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
+    # X, room capacity, student and faculty conflicts
+    model, X, _ = build_base_model(ctx)
 
     # cap 20 per section + count vars
-    sec_sessions = {}
-    for sec in section_ids:
-        tot = model.NewIntVar(0, CAP, f"sessions_{sec}")
-        model.Add(tot == sum(x[(sec, sl)] for sl in slot_ids))
-        model.Add(tot <= CAP)
-        sec_sessions[sec] = tot
+    for i in range(len(section_ids)):
+        row = cp_model.LinearExpr.Sum(X[i, :].tolist())
+        model.Add(row <= CAP)
 
-    total_sessions = model.NewIntVar(0, len(section_ids) * CAP, "total_sessions")
-    model.Add(total_sessions == sum(sec_sessions.values()))
+    total_sessions = cp_model.LinearExpr.Sum(X.ravel().tolist())
     model.Maximize(total_sessions)
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = TIME_LIMIT
-    solver.parameters.num_search_workers = WORKERS
+    maybe_break_symmetry(model, X, ctx)
+
+    if "--no-hint" not in sys.argv:
+        add_hint(model, X, OUTPUT_DIR, HINT_NAME, section_ids, slot_ids)
 
-    status = solver.Solve(model)
+    solver = configure_solver(cp_model.CpSolver(), workers=pick_workers(X.size), time_limit=TIME_LIMIT)
+
+    status = solve_to_bound(solver, model, len(section_ids) * CAP)
+    write_solve_stats(solver, OUTPUT_DIR, Path(__file__).stem)
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         print("No solution.")
         return
 
+    # Per-section session counts, from one batch read of the X values
+    session_counts = solution_matrix(solver, X).sum(axis=1)
+    sec_sessions = dict(zip(section_ids, session_counts.tolist()))
+
     total_val = solver.Value(total_sessions)
     print("\n✅", solver.StatusName(status))
     print("Max total sessions:", total_val, "/ 940")
@@ -100,7 +61,7 @@ def main():
             "section_id": sec,
             "course_id": sec_to_course[sec],
             "faculty": course_to_faculty[sec_to_course[sec]],
-            "sessions": solver.Value(sec_sessions[sec])
+            "sessions": sec_sessions[sec]
         })
     df = pd.DataFrame(rows)
 
@@ -1,14 +1,15 @@
-import pandas as pd
 from pathlib import Path
 
+from data_io import read_table
+
 OUTPUT_DIR = Path("outputs")
 BOTTLENECK = ["DWDV", "BMS", "BV", "SMTI"]
 
-enroll = pd.read_csv(OUTPUT_DIR / "enrollments.csv")
-enroll["course_id"] = enroll["course_id"].astype(str).str.strip()
-enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
+enroll = read_table(OUTPUT_DIR / "enrollments.csv", ["course_id", "student_id"])
 
-counts = enroll.groupby("course_id")["student_id"].nunique().sort_values(ascending=False)
+# Only the bottleneck courses are reported, so count just those
+sub = enroll[enroll["course_id"].isin(BOTTLENECK)]
+counts = sub.groupby("course_id")["student_id"].nunique()
 
 print("\n=== Bottleneck course enrollments ===")
 for c in BOTTLENECK:
@@ -0,0 +1,125 @@
+import numpy as np
+import time
+from pathlib import Path
+from ortools.sat.python import cp_model
+
+from base_model import build_base_model, save_hint, solution_matrix
+from data_io import load_inputs
+from solver_config import configure_solver, pick_workers, solve_to_bound, write_solve_stats
+
+OUTPUT_DIR = Path("outputs")
+
+FLOOR = 18
+CAP = 20
+MAX_PER_WEEK = 2
+PENALTY_PER_MISSED_BELOW_18 = 5
+
+TIME_LIMIT = 240  # per variant
+
+# Same hint 13 saves, so 11/14/44 can still warm-start from this run
+HINT_NAME = "max_total_cap20"
+
+# (name, hard floor, weekly cap, soft-floor objective) in solve order;
+# the cap-only variant goes first and every later one starts from the previous solution
+VARIANTS = [
+    ("max_total_cap20", False, False, False),      # 13 / 14
+    ("softfloor18_max", False, False, True),       # 12
+    ("floor18_max", True, False, False),           # 10
+    ("floor18_weeklycap_max", True, True, False),  # 11
+]
+
+def set_switch(model, lit, on: bool):
+    """
+    Fix an enforcement literal for the next solve by narrowing its domain.
+    (Solving under assumptions instead turns off most of the CP-SAT
+    portfolio and presolve, and found nothing on this model.)
+    """
+    domain = model.Proto().variables[lit.Index()].domain
+    domain[0] = domain[1] = int(on)
+
+def main():
+    """
+    One model for the 10-14 variants (same faculty map, cap 20 everywhere):
+    the hard floor and the weekly cap are posted once behind enforcement
+    literals that are fixed on/off per solve. 44 has its own pre/post-mid
+    faculty rows and still runs as its own script.
+    """
+    ctx = load_inputs(OUTPUT_DIR)
+    section_ids = ctx.section_ids
+    slot_ids = ctx.slot_ids
+    weeks = ctx.weeks
+    slots_by_week = ctx.slots_by_week
+
+    print("\nBuilding model...")
+    # X, room capacity, student and faculty conflicts
+    model, X, _ = build_base_model(ctx)
+
+    use_floor = model.NewBoolVar("use_floor")
+    use_weekly = model.NewBoolVar("use_weekly")
+
+    slot_idx = {sl: j for j, sl in enumerate(slot_ids)}
+    week_cols = {w: [slot_idx[sl] for sl in slots_by_week[w]] for w in weeks}
+
+    shortfall = []  # max(0, 18 - sessions), only priced by the soft-floor objective
+    for i, sec in enumerate(section_ids):
+        row = cp_model.LinearExpr.Sum(X[i, :].tolist())
+        model.Add(row <= CAP)
+        model.Add(row >= FLOOR).OnlyEnforceIf(use_floor)
+        for w in weeks:
+            model.Add(cp_model.LinearExpr.Sum(X[i, week_cols[w]].tolist()) <= MAX_PER_WEEK).OnlyEnforceIf(use_weekly)
+
+        sf = model.NewIntVar(0, FLOOR, f"shortfall_{sec}")
+        model.Add(sf + row >= FLOOR)
+        shortfall.append(sf)
+
+    x_vars = X.ravel().tolist()
+    total_sessions = cp_model.LinearExpr.Sum(x_vars)
+    soft_objective = cp_model.LinearExpr.WeightedSum(
+        x_vars + shortfall,
+        [1] * len(x_vars) + [-PENALTY_PER_MISSED_BELOW_18] * len(shortfall),
+    )
+
+    solver = configure_solver(cp_model.CpSolver(), workers=pick_workers(X.size), time_limit=TIME_LIMIT)
+
+    results = []
+    prev = None
+    for name, floor_on, weekly_on, soft in VARIANTS:
+        model.Maximize(soft_objective if soft else total_sessions)
+        set_switch(model, use_floor, floor_on)
+        set_switch(model, use_weekly, weekly_on)
+        model.ClearHints()
+        if prev is not None:
+            for var, value in zip(X.flat, prev.flat):
+                model.AddHint(var, int(value))
+
+        print(f"\nSolving {name} (floor={FLOOR if floor_on else '-'}, cap={CAP}, "
+              f"weekly<={MAX_PER_WEEK if weekly_on else '-'}, soft floor={'on' if soft else 'off'})...")
+        t0 = time.perf_counter()
+        status = solve_to_bound(solver, model, len(section_ids) * CAP)
+        wall = time.perf_counter() - t0
+        write_solve_stats(solver, OUTPUT_DIR, f"{Path(__file__).stem}_{name}")
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            print("❌ No solution.")
+            print("Status:", solver.StatusName(status))
+            results.append((name, solver.StatusName(status), None, None, wall))
+            continue
+
+        prev = solution_matrix(solver, X)
+        session_counts = prev.sum(axis=1)
+        total_val = int(session_counts.sum())
+        below = int(np.count_nonzero(session_counts < FLOOR))
+        print("✅", solver.StatusName(status))
+        print("Total scheduled sessions:", total_val)
+        print(f"Sections below {FLOOR}:", below)
+        results.append((name, solver.StatusName(status), total_val, below, wall))
+
+        if name == HINT_NAME:
+            save_hint(OUTPUT_DIR, HINT_NAME, section_ids, slot_ids, prev)
+
+    print("\nVariant summary:")
+    for name, status_name, total_val, below, wall in results:
+        print(f"{name:<24} {status_name:<10} total={total_val} below{FLOOR}={below} time={wall:.1f}s")
+
+if __name__ == "__main__":
+    main()
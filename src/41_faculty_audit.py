@@ -1,20 +1,15 @@
-import pandas as pd
 from pathlib import Path
 
+from data_io import read_table
+
 OUTPUT = Path("outputs")
 
 def main():
 
     print("Loading data...")
 
-    courses = pd.read_csv(OUTPUT / "courses.csv")
-    sections = pd.read_csv(OUTPUT / "sections.csv")
-
-    # Clean
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses["faculty_raw"] = courses["faculty_raw"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
+    courses = read_table(OUTPUT / "courses.csv", ["course_id", "faculty_raw"])
+    sections = read_table(OUTPUT / "sections.csv", ["course_id", "section_id"])
 
     # Merge to get faculty per section
     merged = sections.merge(
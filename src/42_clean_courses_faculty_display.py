@@ -1,25 +1,15 @@
 import pandas as pd
 from pathlib import Path
 
+from data_io import FACULTY_OVERRIDE_COLS, FACULTY_OVERRIDES
+
 OUTPUT = Path("outputs")
 
 def main():
-    courses = pd.read_csv(OUTPUT / "courses.csv")
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses["faculty_raw"] = courses["faculty_raw"].astype(str).str.strip()
-
-    # Add two explicit columns (does NOT overwrite faculty_raw)
-    courses["faculty_premid"] = courses["faculty_raw"]
-    courses["faculty_postmid"] = courses["faculty_raw"]
-
-    # Only for DTI
-    mask = courses["course_id"] == "DTI"
-    courses.loc[mask, "faculty_premid"] = "Prof. Rohit Kumar"
-    courses.loc[mask, "faculty_postmid"] = "Prof. Rogers"
-
-    out = OUTPUT / "courses_faculty_split_view.csv"
-    courses.to_csv(out, index=False)
-    print("Saved:", out)
+    # Only the overridden courses are written; 44 falls back to faculty_raw for the rest
+    out = OUTPUT / "courses_faculty_overrides.csv"
+    pd.DataFrame(FACULTY_OVERRIDES, columns=FACULTY_OVERRIDE_COLS).to_csv(out, index=False)
+    print("Saved:", out, f"({len(FACULTY_OVERRIDES)} overrides)")
 
 if __name__ == "__main__":
     main()
@@ -2,6 +2,8 @@ import pandas as pd
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from data_io import load_inputs
+
 OUTPUT_DIR = Path("outputs")
 CAP = 20
 
@@ -15,44 +17,14 @@ DTI_POSTMID_FACULTY = "Prof. Rogers"
 def main():
     print("Loading data...")
 
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
-
-    # Normalize
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    enroll["section_id"] = enroll["section_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses["faculty_raw"] = courses["faculty_raw"].astype(str).str.strip()
-    slots["slot_id"] = slots["slot_id"].astype(str).str.strip()
-    slots["week"] = slots["week"].astype(int)
-
-    # Room capacity column name handling
-    if "room_capacity" in slots.columns:
-        slots["room_capacity"] = slots["room_capacity"].astype(int)
-        slot_capacity = dict(zip(slots["slot_id"], slots["room_capacity"]))
-    elif "room_cap" in slots.columns:
-        slots["room_cap"] = slots["room_cap"].astype(int)
-        slot_capacity = dict(zip(slots["slot_id"], slots["room_cap"]))
-    else:
-        raise ValueError("slots.csv must have room_capacity or room_cap column")
-
-    section_ids = sections["section_id"].unique().tolist()
-    slot_ids = slots["slot_id"].unique().tolist()
-
-    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
-    course_to_faculty_raw = dict(zip(courses["course_id"], courses["faculty_raw"]))
-    slot_to_week = dict(zip(slots["slot_id"], slots["week"]))
-
-    # student -> sections
-    student_to_sections = (
-        enroll.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
+    ctx = load_inputs(OUTPUT_DIR)
+    section_ids = ctx.section_ids
+    slot_ids = ctx.slot_ids
+    sec_to_course = ctx.sec_to_course
+    course_to_faculty_raw = ctx.course_to_faculty
+    slot_to_week = ctx.slot_to_week
+    student_to_sections = ctx.student_to_sections
+    slot_capacity = ctx.slot_capacity
 
     def get_faculty(course_id: str, week: int) -> str:
         course_id = str(course_id).strip()
@@ -1,130 +1,92 @@
+import numpy as np
 import pandas as pd
+import sys
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from base_model import add_hint, build_base_model, faculty_groups, maybe_break_symmetry, solution_matrix
+from data_io import load_inputs, read_faculty_overrides
+from solver_config import configure_solver, pick_workers, solve_to_bound, write_solve_stats
+
 OUTPUT_DIR = Path("outputs")
 
 FLOOR = 18
 CAP = 20
 
 TIME_LIMIT = 240
-WORKERS = 8
 
-DTI_COURSE = "DTI"
-DTI_PREMID_FACULTY = "Prof. Rohit Kumar"
-DTI_POSTMID_FACULTY = "Prof. Rogers"
+# Warm start from 13's cap-only solution (run with --no-hint to solve cold)
+HINT_NAME = "max_total_cap20"
+
+# Pre/post-mid faculty for split courses, written by 42_clean_courses_faculty_display.py
+# (data_io.FACULTY_OVERRIDES is used as is if the file is missing)
+OVERRIDES_FILE = "courses_faculty_overrides.csv"
+MIDTERM_WEEK = 5  # weeks 1..5 are pre-mid
 
 def main():
     print("Loading data...")
 
-    sections = pd.read_csv(OUTPUT_DIR / "sections.csv")
-    enroll = pd.read_csv(OUTPUT_DIR / "section_enrollments.csv")
-    courses = pd.read_csv(OUTPUT_DIR / "courses.csv")
-    slots = pd.read_csv(OUTPUT_DIR / "slots.csv")
-
-    # Normalize
-    sections["section_id"] = sections["section_id"].astype(str).str.strip()
-    sections["course_id"] = sections["course_id"].astype(str).str.strip()
-    enroll["section_id"] = enroll["section_id"].astype(str).str.strip()
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    courses["course_id"] = courses["course_id"].astype(str).str.strip()
-    courses["faculty_raw"] = courses["faculty_raw"].astype(str).str.strip()
-    slots["slot_id"] = slots["slot_id"].astype(str).str.strip()
-    slots["week"] = slots["week"].astype(int)
-
-    # Room capacity column name handling
-    if "room_capacity" in slots.columns:
-        slots["room_capacity"] = slots["room_capacity"].astype(int)
-        slot_capacity = dict(zip(slots["slot_id"], slots["room_capacity"]))
-    elif "room_cap" in slots.columns:
-        slots["room_cap"] = slots["room_cap"].astype(int)
-        slot_capacity = dict(zip(slots["slot_id"], slots["room_cap"]))
-    else:
-        raise ValueError("slots.csv must have room_capacity or room_cap column")
-
-    section_ids = sections["section_id"].unique().tolist()
-    slot_ids = slots["slot_id"].unique().tolist()
-
-    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
-    course_to_faculty_raw = dict(zip(courses["course_id"], courses["faculty_raw"]))
-    slot_to_week = dict(zip(slots["slot_id"], slots["week"]))
-
-    # student -> sections
-    student_to_sections = (
-        enroll.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
-
-    def get_faculty(course_id: str, week: int) -> str:
-        course_id = str(course_id).strip()
-        if course_id == DTI_COURSE:
-            return DTI_PREMID_FACULTY if week <= 5 else DTI_POSTMID_FACULTY
-        return course_to_faculty_raw[course_id]
+    ctx = load_inputs(OUTPUT_DIR)
+    section_ids = ctx.section_ids
+    slot_ids = ctx.slot_ids
+    sec_to_course = ctx.sec_to_course
+    course_to_faculty_raw = ctx.course_to_faculty
+    slot_to_week = ctx.slot_to_week
+
+    ov = read_faculty_overrides(OUTPUT_DIR / OVERRIDES_FILE)
+    print("Faculty overrides:", ", ".join(ov.index) or "none")
+
+    # Pre/post-mid faculty per section (in section order), looked up column-wise
+    sec_course = pd.Series(section_ids).map(sec_to_course).str.strip()
+    base = sec_course.map(course_to_faculty_raw)
+    faculty_cols = {
+        False: sec_course.map(ov["faculty_premid"]).fillna(base),
+        True: sec_course.map(ov["faculty_postmid"]).fillna(base),
+    }
+
+    # Faculty groups (split courses): only two faculty maps exist, pre-mid and post-mid
+    faculty_sets = [faculty_groups(faculty_cols[False]), faculty_groups(faculty_cols[True])]
+    slot_faculty_set = [int(int(slot_to_week[sl]) > MIDTERM_WEEK) for sl in slot_ids]
 
     print("\nBuilding model...")
-    model = cp_model.CpModel()
-
-    x = {(sec, sl): model.NewBoolVar(f"x_{sec}_{sl}") for sec in section_ids for sl in slot_ids}
-
-    # Room capacity
-    for sl in slot_ids:
-        model.Add(sum(x[(sec, sl)] for sec in section_ids) <= int(slot_capacity[sl]))
-
-    # Student conflict
-    for student, secs in student_to_sections.items():
-        if len(secs) <= 1:
-            continue
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
-
-    # Faculty conflict (DTI split)
-    for sl in slot_ids:
-        week = int(slot_to_week[sl])
-        faculty_groups = {}
-        for sec in section_ids:
-            cid = sec_to_course[sec]
-            fac = get_faculty(cid, week)
-            faculty_groups.setdefault(fac, []).append(sec)
-        for fac, secs in faculty_groups.items():
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
+    # X, room capacity, student and faculty conflicts
+    model, X, _ = build_base_model(ctx, faculty_sets, slot_faculty_set)
 
     # Per-section floor/cap
-    sec_sessions = {}
-    for sec in section_ids:
-        tot = model.NewIntVar(0, len(slot_ids), f"sessions_{sec}")
-        model.Add(tot == sum(x[(sec, sl)] for sl in slot_ids))
-        model.Add(tot >= FLOOR)
-        model.Add(tot <= CAP)
-        sec_sessions[sec] = tot
-
-    total_sessions = model.NewIntVar(0, len(section_ids) * CAP, "total_sessions")
-    model.Add(total_sessions == sum(sec_sessions.values()))
+    for i in range(len(section_ids)):
+        model.AddLinearConstraint(cp_model.LinearExpr.Sum(X[i, :].tolist()), FLOOR, CAP)
+
+    total_sessions = cp_model.LinearExpr.Sum(X.ravel().tolist())
     model.Maximize(total_sessions)
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = TIME_LIMIT
-    solver.parameters.num_search_workers = WORKERS
+    maybe_break_symmetry(model, X, ctx, faculty_sets)
+
+    if "--no-hint" not in sys.argv:
+        add_hint(model, X, OUTPUT_DIR, HINT_NAME, section_ids, slot_ids)
+
+    solver = configure_solver(cp_model.CpSolver(), workers=pick_workers(X.size), time_limit=TIME_LIMIT)
 
-    print(f"\nSolving (floor={FLOOR}, cap={CAP}, maximize total, DTI split ON)...")
-    status = solver.Solve(model)
+    print(f"\nSolving (floor={FLOOR}, cap={CAP}, maximize total, faculty split ON)...")
+    status = solve_to_bound(solver, model, len(section_ids) * CAP)
+    write_solve_stats(solver, OUTPUT_DIR, Path(__file__).stem)
 
     if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         print("\n❌ No solution.")
         print("Status:", solver.StatusName(status))
         return
 
+    # Per-section session counts, from one batch read of the X values
+    session_counts = solution_matrix(solver, X).sum(axis=1)
+    sec_sessions = dict(zip(section_ids, session_counts.tolist()))
+
     print("\n✅", solver.StatusName(status))
     tot_val = solver.Value(total_sessions)
     print("Total scheduled sessions:", tot_val)
     print("Average per section:", round(tot_val / len(section_ids), 2))
 
     # Distribution
-    dist = {18: 0, 19: 0, 20: 0}
-    for sec in section_ids:
-        v = solver.Value(sec_sessions[sec])
-        if v in dist:
-            dist[v] += 1
+    by_count = np.bincount(session_counts, minlength=21)
+    dist = {k: int(by_count[k]) for k in (18, 19, 20)}
     print("\nSection session distribution:")
     for k in sorted(dist):
         print(f"{k} sessions:", dist[k])
@@ -135,7 +97,7 @@ def main():
         rows.append({
             "section_id": sec,
             "course_id": sec_to_course[sec],
-            "sessions": solver.Value(sec_sessions[sec]),
+            "sessions": sec_sessions[sec],
         })
     out = pd.DataFrame(rows).sort_values(["sessions","course_id","section_id"], ascending=[True, True, True])
     out_path = OUTPUT_DIR / "section_sessions_floor18_cap20_facsplit.csv"
@@ -1,14 +1,24 @@
+import numpy as np
 import pandas as pd
+import sys
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from base_model import (
+    add_matrix_hint, build_base_model, faculty_groups, greedy_hint, maybe_break_symmetry,
+    solution_matrix, student_bundle_rows,
+)
+from data_io import load_inputs, write_table
+from solver_config import configure_solver, pick_workers
+
 OUT = Path("outputs")
 
 FLOOR = 18
 CAP = 20
 
 TIME_LIMIT = 300
-WORKERS = 8
+# Stop once within 1% of the best bound (a few sessions out of ~900)
+GAP_LIMIT = 0.01
 
 DTI_COURSE = "DTI"
 DTI_PREMID_FACULTY = "Prof. Rohit Kumar"
@@ -17,42 +27,14 @@ DTI_POSTMID_FACULTY = "Prof. Rogers"
 def main():
     print("Loading data...")
 
-    sections = pd.read_csv(OUT / "sections.csv")
-    enroll = pd.read_csv(OUT / "section_enrollments.csv")
-    courses = pd.read_csv(OUT / "courses.csv")
-    slots = pd.read_csv(OUT / "slots.csv")
-
-    # Normalize
-    for df in [sections, enroll, courses, slots]:
-        for col in df.columns:
-            if df[col].dtype == "object":
-                df[col] = df[col].astype(str).str.strip()
-
-    slots["week"] = slots["week"].astype(int)
-
-    # room capacity column name
-    if "room_cap" in slots.columns:
-        slots["room_cap"] = slots["room_cap"].astype(int)
-        slot_capacity = dict(zip(slots["slot_id"], slots["room_cap"]))
-    elif "room_capacity" in slots.columns:
-        slots["room_capacity"] = slots["room_capacity"].astype(int)
-        slot_capacity = dict(zip(slots["slot_id"], slots["room_capacity"]))
-    else:
-        raise ValueError("slots.csv must contain room_cap or room_capacity")
-
-    section_ids = sections["section_id"].unique().tolist()
-    slot_ids = slots["slot_id"].unique().tolist()
-
-    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
-    course_to_faculty_raw = dict(zip(courses["course_id"], courses["faculty_raw"]))
-    slot_to_week = dict(zip(slots["slot_id"], slots["week"]))
-
-    # student -> sections
-    student_to_sections = (
-        enroll.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
+    ctx = load_inputs(OUT)
+    slots = ctx.slots
+    section_ids = ctx.section_ids
+    slot_ids = ctx.slot_ids
+    sec_to_course = ctx.sec_to_course
+    course_to_faculty_raw = ctx.course_to_faculty
+    slot_capacity = ctx.slot_capacity
+    slot_to_week = ctx.slot_to_week
 
     def get_faculty(course_id: str, week: int) -> str:
         course_id = str(course_id).strip()
@@ -60,50 +42,40 @@ def main():
             return DTI_PREMID_FACULTY if week <= 5 else DTI_POSTMID_FACULTY
         return course_to_faculty_raw[course_id]
 
+    # Faculty only depends on pre/post-mid (DTI split), so group sections once per half
+    faculty_sets = [
+        faculty_groups([get_faculty(sec_to_course[sec], week) for sec in section_ids])
+        for week in (1, 6)
+    ]
+    slot_faculty_set = [int(int(slot_to_week[sl]) > 5) for sl in slot_ids]
+
     print("\nBuilding model (floor=18 cap=20 maximize total)...")
-    model = cp_model.CpModel()
+    # X, room capacity, student and faculty conflicts (week-aware faculty map per slot)
+    model, X, sec_idx = build_base_model(ctx, faculty_sets, slot_faculty_set)
 
-    x = {(sec, sl): model.NewBoolVar(f"x_{sec}_{sl}")
-         for sec in section_ids for sl in slot_ids}
+    # Floor/cap + objective (posted on the row sums directly, no per-section IntVars)
+    for i in range(len(section_ids)):
+        model.AddLinearConstraint(cp_model.LinearExpr.Sum(X[i, :].tolist()), FLOOR, CAP)
 
-    # Room capacity per slot
-    for sl in slot_ids:
-        model.Add(sum(x[(sec, sl)] for sec in section_ids) <= int(slot_capacity[sl]))
+    total_sessions = cp_model.LinearExpr.Sum(X.ravel().tolist())
+    model.Maximize(total_sessions)
 
-    # Student conflict per slot
-    for student, secs in student_to_sections.items():
-        if len(secs) <= 1:
-            continue
-        for sl in slot_ids:
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
+    maybe_break_symmetry(model, X, ctx, faculty_sets)
 
-    # Faculty conflict per slot (DTI split week-aware)
-    for sl in slot_ids:
-        week = int(slot_to_week[sl])
-        faculty_groups = {}
-        for sec in section_ids:
-            cid = sec_to_course[sec]
-            fac = get_faculty(cid, week)
-            faculty_groups.setdefault(fac, []).append(sec)
-        for fac, secs in faculty_groups.items():
-            model.Add(sum(x[(sec, sl)] for sec in secs) <= 1)
-
-    # Floor/cap + objective
-    sec_sessions = {}
-    for sec in section_ids:
-        tot = model.NewIntVar(0, CAP, f"sessions_{sec}")
-        model.Add(tot == sum(x[(sec, sl)] for sl in slot_ids))
-        model.Add(tot >= FLOOR)
-        model.Add(tot <= CAP)
-        sec_sessions[sec] = tot
-
-    total_sessions = model.NewIntVar(0, len(section_ids) * CAP, "total_sessions")
-    model.Add(total_sessions == sum(sec_sessions.values()))
-    model.Maximize(total_sessions)
+    # Warm start from a greedy fill (run with --no-hint to solve cold)
+    if "--no-hint" not in sys.argv:
+        bundle_rows = student_bundle_rows(ctx, sec_idx)
+        hint = greedy_hint(
+            [CAP] * len(section_ids),
+            [int(slot_capacity[sl]) for sl in slot_ids],
+            [bundle_rows + groups for groups in faculty_sets],
+            slot_faculty_set,
+        )
+        add_matrix_hint(model, X, hint)
+        print("Greedy hint:", int(hint.sum()), "sessions")
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = TIME_LIMIT
-    solver.parameters.num_search_workers = WORKERS
+    solver = configure_solver(cp_model.CpSolver(), workers=pick_workers(X.size), time_limit=TIME_LIMIT,
+                              linearization_level=2, relative_gap_limit=GAP_LIMIT)
 
     print("\nSolving...")
     status = solver.Solve(model)
@@ -116,47 +88,43 @@ def main():
     print("Total scheduled sessions:", solver.Value(total_sessions),
           f"(avg {solver.Value(total_sessions)/len(section_ids):.2f})")
 
-    # Export schedule rows
+    # Export schedule rows (X values read from the response in one batch)
+    sol = solution_matrix(solver, X)
+    slot_info = dict(zip(slots["slot_id"], zip(slots["day"], slots["start"], slots["end"])))
     rows = []
-    for sec in section_ids:
+    for i, j in zip(*np.nonzero(sol)):
+        sec, sl = section_ids[i], slot_ids[j]
         course_id = sec_to_course[sec]
-        for sl in slot_ids:
-            if solver.Value(x[(sec, sl)]) == 1:
-                week = int(slot_to_week[sl])
-                rows.append({
-                    "slot_id": sl,
-                    "week": week,
-                    "section_id": sec,
-                    "course_id": course_id,
-                    "faculty": get_faculty(course_id, week),
-                })
-
-    sched = pd.DataFrame(rows).merge(
-        slots[["slot_id", "day", "start", "end"]],
-        on="slot_id",
-        how="left"
-    )
+        week = int(slot_to_week[sl])
+        day, start, end = slot_info[sl]
+        rows.append({
+            "slot_id": sl,
+            "week": week,
+            "section_id": sec,
+            "course_id": course_id,
+            "faculty": get_faculty(course_id, week),
+            "day": day,
+            "start": start,
+            "end": end,
+        })
+
+    sched = pd.DataFrame.from_records(rows)
 
     # Assign room numbers within each slot (Room_1..Room_cap_used)
-    sched["room_number"] = ""
     sched = sched.sort_values(["week", "day", "start", "section_id"]).reset_index(drop=True)
-
-    for sl, grp in sched.groupby("slot_id"):
-        idxs = grp.index.tolist()
-        for i, idx in enumerate(idxs):
-            sched.at[idx, "room_number"] = f"Room_{i+1}"
+    sched["room_number"] = "Room_" + (sched.groupby("slot_id").cumcount() + 1).astype(str)
 
     out_path = OUT / "term_schedule_floor18.csv"
-    sched.to_csv(out_path, index=False)
+    write_table(sched, out_path)
     print("Saved:", out_path)
 
     # Also save per-section sessions (sanity)
     sess_rows = []
-    for sec in section_ids:
+    for sec, n_sessions in zip(section_ids, sol.sum(axis=1).tolist()):
         sess_rows.append({
             "section_id": sec,
             "course_id": sec_to_course[sec],
-            "sessions": solver.Value(sec_sessions[sec]),
+            "sessions": n_sessions,
         })
     pd.DataFrame(sess_rows).to_csv(OUT / "term_section_sessions_floor18.csv", index=False)
     print("Saved:", OUT / "term_section_sessions_floor18.csv")
@@ -1,7 +1,10 @@
-import pandas as pd
+import numpy as np
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from data_io import cached_table, group_lists
+from solver_config import configure_solver, pick_workers
+
 OUTPUT = Path("outputs")
 
 MAX_DAYS = 5
@@ -9,22 +12,16 @@ SLOTS_PER_DAY = 7
 ROOMS = 10
 
 TIME_LIMIT = 180
-WORKERS = 8
 
 def main():
 
     print("Loading data...")
 
-    sections_df = pd.read_csv(OUTPUT / "sections.csv")
-    enroll_df = pd.read_csv(OUTPUT / "section_enrollments.csv")
-    courses_df = pd.read_csv(OUTPUT / "courses.csv")
-    sess_df = pd.read_csv(OUTPUT / "section_sessions_floor18_cap20_facsplit.csv")
-
-    # Clean
-    for df in [sections_df, enroll_df, courses_df, sess_df]:
-        for col in df.columns:
-            if df[col].dtype == "object":
-                df[col] = df[col].astype(str).str.strip()
+    # Typed Parquet copies (strings already stripped), written on the first CSV read
+    sections_df = cached_table(OUTPUT / "sections.csv", ["section_id", "course_id"])
+    enroll_df = cached_table(OUTPUT / "section_enrollments.csv", ["section_id", "student_id"])
+    courses_df = cached_table(OUTPUT / "courses.csv", ["course_id", "faculty_raw"])
+    sess_df = cached_table(OUTPUT / "section_sessions_floor18_cap20_facsplit.csv", ["section_id", "course_id"])
 
     # Build deficit
     sess_df["deficit"] = 20 - sess_df["sessions"]
@@ -36,11 +33,7 @@ def main():
     deficit_map = dict(zip(deficit_df["section_id"], deficit_df["deficit"]))
 
     # student mapping
-    student_to_sections = (
-        enroll_df.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
+    student_to_sections = group_lists(enroll_df["student_id"].to_numpy(), enroll_df["section_id"].to_numpy())
 
     # section → faculty
     sec_to_course = dict(zip(sections_df["section_id"], sections_df["course_id"]))
@@ -51,55 +44,51 @@ def main():
     days = range(MAX_DAYS)
     slots = range(SLOTS_PER_DAY)
 
-    # Decision vars
-    x = {}
-    for s in section_ids:
-        for d in days:
-            for t in slots:
-                x[s,d,t] = model.NewBoolVar(f"x_{s}_{d}_{t}")
+    # Decision vars: X[i, d, t] = section i meets on day d in slot t (unnamed vars)
+    sec_idx = {s: i for i, s in enumerate(section_ids)}
+    X = np.empty((len(section_ids), MAX_DAYS, SLOTS_PER_DAY), dtype=object)
+    X.flat[:] = [model.NewBoolVar("") for _ in range(X.size)]
 
     y = {d: model.NewBoolVar(f"y_{d}") for d in days}
 
     # Each section must get its deficit sessions
-    for s in section_ids:
-        model.Add(sum(x[s,d,t] for d in days for t in slots) == deficit_map[s])
+    for i, s in enumerate(section_ids):
+        model.Add(cp_model.LinearExpr.Sum(X[i].ravel().tolist()) == deficit_map[s])
 
     # Room capacity
     for d in days:
         for t in slots:
-            model.Add(sum(x[s,d,t] for s in section_ids) <= ROOMS)
+            model.Add(cp_model.LinearExpr.Sum(X[:, d, t].tolist()) <= ROOMS)
 
-    # Student conflict
-    for student, secs in student_to_sections.items():
-        relevant_secs = [s for s in secs if s in section_ids]
-        if len(relevant_secs) <= 1:
-            continue
+    # Student conflict (only deficit sections; students with the same bundle share one row)
+    student_bundles = {tuple(sorted({sec_idx[s] for s in secs if s in sec_idx})) for secs in student_to_sections.values()}
+    for bundle in sorted(b for b in student_bundles if len(b) > 1):
+        rows = list(bundle)
         for d in days:
             for t in slots:
-                model.Add(sum(x[s,d,t] for s in relevant_secs) <= 1)
-
-    # Faculty conflict
+                model.AddAtMostOne(X[rows, d, t].tolist())
+
+    # Faculty conflict (groups built once; single-section faculty need no row)
+    faculty_groups = {}
+    for i, s in enumerate(section_ids):
+        fac = course_to_faculty[sec_to_course[s]]
+        faculty_groups.setdefault(fac, []).append(i)
+    faculty_groups = {fac: rows for fac, rows in faculty_groups.items() if len(rows) > 1}
     for d in days:
         for t in slots:
-            faculty_groups = {}
-            for s in section_ids:
-                fac = course_to_faculty[sec_to_course[s]]
-                faculty_groups.setdefault(fac, []).append(s)
-            for fac, secs in faculty_groups.items():
-                model.Add(sum(x[s,d,t] for s in secs) <= 1)
-
-    # Link x to y
+            for fac, rows in faculty_groups.items():
+                model.AddAtMostOne(X[rows, d, t].tolist())
+
+    # Link x to y: one aggregated row per day (a day holds at most ROOMS per slot,
+    # and never more than the whole deficit)
+    day_cap = min(ROOMS * SLOTS_PER_DAY, int(deficit_df["deficit"].sum()))
     for d in days:
-        for s in section_ids:
-            for t in slots:
-                model.Add(x[s,d,t] <= y[d])
+        model.Add(cp_model.LinearExpr.Sum(X[:, d, :].ravel().tolist()) <= day_cap * y[d])
 
     # Objective: minimize contingent days
-    model.Minimize(sum(y[d] for d in days))
+    model.Minimize(cp_model.LinearExpr.Sum([y[d] for d in days]))
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = TIME_LIMIT
-    solver.parameters.num_search_workers = WORKERS
+    solver = configure_solver(cp_model.CpSolver(), workers=pick_workers(X.size), time_limit=TIME_LIMIT, linearization_level=2)
 
     print("Solving contingent model...")
     status = solver.Solve(model)
@@ -1,12 +1,17 @@
+import numpy as np
 import pandas as pd
+import sys
 from pathlib import Path
 from ortools.sat.python import cp_model
 
+from base_model import add_matrix_hint, greedy_hint, solution_matrix
+from data_io import cached_table, group_lists
+from solver_config import configure_solver, pick_workers
+
 OUT = Path("outputs")
 
 CAP_TOTAL = 20
 TIME_LIMIT = 240
-WORKERS = 8
 
 def day_num(label: str) -> int:
     # "C10" -> 10
@@ -15,17 +20,12 @@ def day_num(label: str) -> int:
 def main():
     print("Loading data...")
 
-    sections_df = pd.read_csv(OUT / "sections.csv")
-    enroll_df = pd.read_csv(OUT / "section_enrollments.csv")
-    courses_df = pd.read_csv(OUT / "courses.csv")
-    base_df = pd.read_csv(OUT / "section_sessions_floor18_cap20_facsplit.csv")
-    cslots_df = pd.read_csv(OUT / "contingent_slots.csv")
-
-    # Clean strings
-    for df in [sections_df, enroll_df, courses_df, base_df, cslots_df]:
-        for col in df.columns:
-            if df[col].dtype == "object":
-                df[col] = df[col].astype(str).str.strip()
+    # Typed Parquet copies (strings already stripped), written on the first CSV read
+    sections_df = cached_table(OUT / "sections.csv", ["section_id", "course_id"])
+    enroll_df = cached_table(OUT / "section_enrollments.csv", ["section_id", "student_id"])
+    courses_df = cached_table(OUT / "courses.csv", ["course_id", "faculty_raw"])
+    base_df = cached_table(OUT / "section_sessions_floor18_cap20_facsplit.csv", ["section_id", "course_id"])
+    cslots_df = cached_table(OUT / "contingent_slots.csv", ["c_slot_id", "c_day"])
 
     # Compute deficits
     base_df["deficit"] = CAP_TOTAL - base_df["sessions"]
@@ -45,16 +45,9 @@ def main():
     sec_to_course = dict(zip(sections_df["section_id"], sections_df["course_id"]))
     course_to_faculty = dict(zip(courses_df["course_id"], courses_df["faculty_raw"]))
 
-    # Student -> sections then keep only deficit sections
-    student_to_sections = (
-        enroll_df.groupby("student_id")["section_id"]
-        .apply(list)
-        .to_dict()
-    )
-    for sid in list(student_to_sections.keys()):
-        student_to_sections[sid] = [s for s in student_to_sections[sid] if s in deficit]
-        if not student_to_sections[sid]:
-            del student_to_sections[sid]
+    # Student -> sections, keeping only deficit sections (students with none drop out)
+    deficit_enroll = enroll_df[enroll_df["section_id"].isin(deficit.keys())]
+    student_to_sections = group_lists(deficit_enroll["student_id"].to_numpy(), deficit_enroll["section_id"].to_numpy())
 
     # -------------------------
     # DIAGNOSTIC: deficit load per student
@@ -102,46 +95,66 @@ def main():
     # -------------------------
     model = cp_model.CpModel()
 
-    # x[s, cs] : schedule section s in contingent slot cs
-    x = {(s, cs): model.NewBoolVar(f"x_{s}_{cs}") for s in section_ids for cs in cslot_ids}
+    # X[i, k] : schedule section i in contingent slot k (unnamed vars)
+    sec_idx = {s: i for i, s in enumerate(section_ids)}
+    X = np.empty((len(section_ids), len(cslot_ids)), dtype=object)
+    X.flat[:] = [model.NewBoolVar("") for _ in range(X.size)]
 
     # y[d] : contingent day used
     y = {d: model.NewBoolVar(f"y_{d}") for d in day_labels}
 
     # Deficit fulfillment
-    for s in section_ids:
-        model.Add(sum(x[(s, cs)] for cs in cslot_ids) == int(deficit[s]))
+    for i, s in enumerate(section_ids):
+        model.Add(cp_model.LinearExpr.Sum(X[i, :].tolist()) == int(deficit[s]))
 
     # Room capacity per contingent slot
-    for cs in cslot_ids:
-        model.Add(sum(x[(s, cs)] for s in section_ids) <= int(cslot_cap[cs]))
+    for k, cs in enumerate(cslot_ids):
+        model.Add(cp_model.LinearExpr.Sum(X[:, k].tolist()) <= int(cslot_cap[cs]))
 
-    # Student conflict per contingent slot
-    for sid, secs in student_to_sections.items():
-        if len(secs) <= 1:
-            continue
-        for cs in cslot_ids:
-            model.Add(sum(x[(s, cs)] for s in secs) <= 1)
+    # Student conflict per contingent slot (students with the same bundle share one row)
+    student_bundles = {tuple(sorted(set(secs))) for secs in student_to_sections.values() if len(set(secs)) > 1}
+    bundle_rows = [[sec_idx[s] for s in secs] for secs in sorted(student_bundles)]
+    for rows in bundle_rows:
+        for k in range(len(cslot_ids)):
+            model.AddAtMostOne(X[rows, k].tolist())
 
     # Faculty conflict per contingent slot
-    for cs in cslot_ids:
-        for fac, secs in faculty_to_secs.items():
-            if len(secs) > 1:
-                model.Add(sum(x[(s, cs)] for s in secs) <= 1)
-
-    # Link x to y(day)
+    faculty_rows = [[sec_idx[s] for s in secs] for secs in faculty_to_secs.values() if len(secs) > 1]
+    for k in range(len(cslot_ids)):
+        for rows in faculty_rows:
+            model.AddAtMostOne(X[rows, k].tolist())
+
+    # Link x to y(day): one aggregated row per day, bounded by the day's
+    # room slots and by the total deficit
+    cslot_idx = {cs: k for k, cs in enumerate(cslot_ids)}
     for d in day_labels:
-        for cs in day_to_slots[d]:
-            for s in section_ids:
-                model.Add(x[(s, cs)] <= y[d])
-
-    # Objective: minimize days used
-    model.Minimize(sum(y[d] for d in day_labels))
+        cols = [cslot_idx[cs] for cs in day_to_slots[d]]
+        day_cap = min(sum(int(cslot_cap[cs]) for cs in day_to_slots[d]), total_need)
+        model.Add(cp_model.LinearExpr.Sum(X[:, cols].ravel().tolist()) <= day_cap * y[d])
+
+    # Objective: minimize days used; ties go to the earliest days (the weight on the
+    # day count exceeds any sum of day numbers, so the count always dominates)
+    y_vars = [y[d] for d in day_labels]
+    day_weight = sum(day_num(d) for d in day_labels) + 1
+    model.Minimize(cp_model.LinearExpr.WeightedSum(y_vars, [day_weight + day_num(d) for d in day_labels]))
+
+    # Warm start: largest deficits first, packed into the earliest contingent slots
+    # (run with --no-hint to solve cold)
+    if "--no-hint" not in sys.argv:
+        hint = greedy_hint(
+            [int(deficit[s]) for s in section_ids],
+            [int(cslot_cap[cs]) for cs in cslot_ids],
+            [bundle_rows + faculty_rows],
+            [0] * len(cslot_ids),
+        )
+        add_matrix_hint(model, X, hint)
+        hint_days = {d: int(hint[:, [cslot_idx[cs] for cs in day_to_slots[d]]].any()) for d in day_labels}
+        for d in day_labels:
+            model.AddHint(y[d], hint_days[d])
+        print("Greedy hint:", int(hint.sum()), "/", total_need, "sessions,", sum(hint_days.values()), "days")
 
     # Solve
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = TIME_LIMIT
-    solver.parameters.num_search_workers = WORKERS
+    solver = configure_solver(cp_model.CpSolver(), workers=pick_workers(X.size), time_limit=TIME_LIMIT, linearization_level=2)
 
     print("\nSolving contingent-days minimization...")
     status = solver.Solve(model)
@@ -156,18 +169,17 @@ def main():
     print("Contingent days used:", len(used))
     print("Days used:", used)
 
-    # Export schedule
+    # Export schedule (X values read from the response in one batch)
     rows = []
-    for s in section_ids:
-        for cs in cslot_ids:
-            if solver.Value(x[(s, cs)]) == 1:
-                rows.append({
-                    "section_id": s,
-                    "course_id": sec_to_course[s],
-                    "faculty": course_to_faculty[sec_to_course[s]],
-                    "c_slot_id": cs,
-                    "c_day": cslot_to_day[cs],
-                })
+    for i, k in zip(*np.nonzero(solution_matrix(solver, X))):
+        s, cs = section_ids[i], cslot_ids[k]
+        rows.append({
+            "section_id": s,
+            "course_id": sec_to_course[s],
+            "faculty": course_to_faculty[sec_to_course[s]],
+            "c_slot_id": cs,
+            "c_day": cslot_to_day[cs],
+        })
 
     sched = pd.DataFrame(rows)
 
@@ -2,9 +2,12 @@
 # Faculty load heatmap: rows = faculty, cols = week (1..10), values = #sessions scheduled
 
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from data_io import memo_table
+
 OUT = Path("outputs")
 DASH = OUT / "dashboard"
 DASH.mkdir(parents=True, exist_ok=True)
@@ -19,6 +22,8 @@ SCHEDULE_CANDIDATES = [
     "timetable.csv",
 ]
 
+MIDTERM_WEEK = 5  # weeks 1..5 are pre-mid (DTI's first faculty)
+
 def find_schedule():
     for name in SCHEDULE_CANDIDATES:
         p = OUT / name
@@ -41,31 +46,34 @@ def get_col(df, options):
             return c
     return None
 
-def parse_faculty_for_course(course_id: str, week: int, faculty_raw: str) -> str:
+def parse_faculty_for_course(course_ids: pd.Series, weeks: pd.Series, faculty_raw: pd.Series) -> np.ndarray:
     """
-    Handles DTI split case:
+    Handles DTI split case (column-wise over the whole schedule):
     'Prof. Rohit Kumar (Premid) + Prof. Rojers Puthur Josrph (Postmid)'
     Weeks 1-5 -> Rohit; Weeks 6-10 -> Rojers
     Otherwise, return faculty_raw (cleaned).
     """
-    fr = (faculty_raw or "").strip()
+    fr = faculty_raw.fillna("").str.strip()
 
     # If course is DTI and has the combined string, split by '+'
-    if str(course_id).strip().upper() == "DTI" and "+" in fr and ("Premid" in fr or "Postmid" in fr):
-        parts = [p.strip() for p in fr.split("+")]
-        premid = parts[0].strip()
-        postmid = parts[1].strip() if len(parts) > 1 else premid
-
-        # pick by week boundary (your spec: first 10 sessions vs last 10;
-        # operationally we map as Week 1-5 vs 6-10)
-        return premid if week <= 5 else postmid
+    is_split = (
+        (course_ids.str.strip().str.upper() == "DTI")
+        & fr.str.contains("+", regex=False)
+        & (fr.str.contains("Premid", regex=False) | fr.str.contains("Postmid", regex=False))
+    )
+    parts = fr.str.split("+", expand=True)
+    premid = parts[0].str.strip()
+    postmid = parts[1].str.strip() if 1 in parts.columns else premid
 
-    return fr if fr else "Unknown Faculty"
+    # pick by week boundary (your spec: first 10 sessions vs last 10;
+    # operationally we map as Week 1-5 vs 6-10)
+    plain = fr.where(fr != "", "Unknown Faculty")
+    return np.where(is_split & (weeks <= MIDTERM_WEEK), premid, np.where(is_split, postmid, plain))
 
 def main():
     # --- load schedule ---
     sched_path = find_schedule()
-    sched = pd.read_csv(sched_path)
+    sched = memo_table(sched_path)
     sched = normalize_cols(sched)
 
     # Required: week + course_id (or section_id with sections map)
@@ -81,7 +89,7 @@ def main():
     if not courses_path.exists():
         raise FileNotFoundError("Missing outputs/courses.csv (needed for faculty mapping).")
 
-    courses = pd.read_csv(courses_path)
+    courses = memo_table(courses_path, ["course_id", "faculty_raw"])
     courses = normalize_cols(courses)
 
     # Your courses.csv has faculty_raw
@@ -98,7 +106,7 @@ def main():
         sections_path = OUT / "sections.csv"
         if not sections_path.exists():
             raise FileNotFoundError("Missing outputs/sections.csv (needed to map section->course).")
-        sections = pd.read_csv(sections_path)
+        sections = memo_table(sections_path, ["section_id", "course_id"])
         sections = normalize_cols(sections)
         if "section_id" not in sections.columns or "course_id" not in sections.columns:
             raise KeyError("sections.csv must have section_id and course_id.")
@@ -109,13 +117,8 @@ def main():
     # Build faculty column in schedule
     course_to_faculty = dict(zip(courses["course_id"].astype(str).str.strip(), courses["faculty_raw"].astype(str)))
 
-    def faculty_for_row(row):
-        week = int(row[week_col])
-        cid = str(row[course_col]).strip()
-        fraw = course_to_faculty.get(cid, "")
-        return parse_faculty_for_course(cid, week, fraw)
-
-    sched["faculty"] = sched.apply(faculty_for_row, axis=1)
+    cids = sched[course_col].astype(str).str.strip()
+    sched["faculty"] = parse_faculty_for_course(cids, sched[week_col].astype(int), cids.map(course_to_faculty))
 
     # Each row is one scheduled session (should be true for your term schedule export)
     # If your file has a 'sessions' column (aggregated), we handle that too.
@@ -151,12 +154,10 @@ def main():
     plt.xticks(range(0, 10), [str(i) for i in range(1, 11)])
     plt.yticks(range(len(heat.index)), heat.index)
 
-    # annotate numbers (looks elite if kept subtle)
-    for i in range(heat.shape[0]):
-        for j in range(heat.shape[1]):
-            val = int(heat.values[i, j])
-            if val > 0:
-                plt.text(j, i, str(val), ha="center", va="center", fontsize=8)
+    # annotate numbers (looks elite if kept subtle); only the non-zero cells get a text artist
+    vals = heat.to_numpy(dtype=int)
+    for i, j in zip(*np.nonzero(vals)):
+        plt.text(j, i, str(vals[i, j]), ha="center", va="center", fontsize=8)
 
     plt.colorbar(label="Sessions")
     out_path = DASH / "faculty_load_heatmap.png"
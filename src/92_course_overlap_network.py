@@ -2,11 +2,14 @@
 # Elite visual: course overlap network (top N courses by enrollment)
 # Nodes=courses, edges weighted by #common students
 
+import hashlib
+import json
 from pathlib import Path
-import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 
+from data_io import memo_table
+
 OUT = Path("outputs")
 DASH = OUT / "dashboard"
 DASH.mkdir(parents=True, exist_ok=True)
@@ -14,15 +17,35 @@ DASH.mkdir(parents=True, exist_ok=True)
 TOP_N = 12          # keep 10-15 for readability
 MIN_EDGE = 25       # show only strong overlaps (tune: 15/20/25)
 
+LAYOUT_SEED = 7
+LAYOUT_DIR = DASH / "layouts"   # cached node positions, one file per graph
+
+def cached_layout(G):
+    """
+    spring_layout positions for G, reused from disk when the same graph
+    (nodes, weighted edges, seed) was laid out before.
+    """
+    key = json.dumps({
+        "nodes": sorted(G.nodes),
+        "edges": sorted((min(u, v), max(u, v), d["weight"]) for u, v, d in G.edges(data=True)),
+        "seed": LAYOUT_SEED,
+    })
+    path = LAYOUT_DIR / f"pos_{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}.json"
+    if path.exists():
+        return {n: tuple(xy) for n, xy in json.loads(path.read_text()).items()}
+
+    pos = nx.spring_layout(G, seed=LAYOUT_SEED, k=1.0)
+    LAYOUT_DIR.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({n: [float(x), float(y)] for n, (x, y) in pos.items()}))
+    return pos
+
 def main():
     enroll_path = OUT / "enrollments.csv"
     if not enroll_path.exists():
         raise FileNotFoundError("outputs/enrollments.csv missing. Run your 01_load_data.py first.")
 
-    enroll = pd.read_csv(enroll_path)
+    enroll = memo_table(enroll_path, ["student_id", "course_id"])
     enroll.columns = [c.strip().lower() for c in enroll.columns]
-    enroll["student_id"] = enroll["student_id"].astype(str).str.strip()
-    enroll["course_id"]  = enroll["course_id"].astype(str).str.strip()
     enroll = enroll.drop_duplicates(["student_id", "course_id"])
 
     # top N courses by enrollment
@@ -31,34 +54,25 @@ def main():
 
     e = enroll[enroll["course_id"].isin(top_courses)].copy()
 
-    # Build student -> list of courses
-    stu_courses = e.groupby("student_id")["course_id"].apply(list)
-
-    # Pairwise overlaps
-    overlap = {}
-    for courses in stu_courses:
-        courses = sorted(set(courses))
-        for i in range(len(courses)):
-            for j in range(i+1, len(courses)):
-                a, b = courses[i], courses[j]
-                overlap[(a, b)] = overlap.get((a, b), 0) + 1
+    # Pairwise overlaps: self-join on student, keep each course pair once (a < b)
+    pairs = e.merge(e, on="student_id")
+    pairs = pairs[pairs["course_id_x"] < pairs["course_id_y"]]
+    overlap = pairs.groupby(["course_id_x", "course_id_y"]).size()
 
     # Graph
     G = nx.Graph()
     for c in top_courses:
         G.add_node(c, size=int(course_sizes[c]))
 
-    for (a, b), w in overlap.items():
-        if w >= MIN_EDGE:
-            G.add_edge(a, b, weight=w)
+    G.add_weighted_edges_from((a, b, int(w)) for (a, b), w in overlap[overlap >= MIN_EDGE].items())
 
     if G.number_of_edges() == 0:
         print("⚠️ No edges met MIN_EDGE threshold. Lower MIN_EDGE and rerun.")
         print("Try MIN_EDGE=15 or 20.")
         return
 
-    # Positions
-    pos = nx.spring_layout(G, seed=7, k=1.0)
+    # Positions (cached per graph)
+    pos = cached_layout(G)
 
     # Node sizes scaled
     node_sizes = [G.nodes[n]["size"] for n in G.nodes]
@@ -74,7 +88,7 @@ def main():
     nx.draw_networkx_edges(G, pos, width=edge_widths, alpha=0.55)
 
     # Edge labels (only for stronger edges to keep clean)
-    strong_edges = {(u, v): G[u][v]["weight"] for u, v in G.edges if G[u][v]["weight"] >= (MIN_EDGE + 10)}
+    strong_edges = {(u, v): w for u, v, w in G.edges(data="weight") if w >= MIN_EDGE + 10}
     nx.draw_networkx_edge_labels(G, pos, edge_labels=strong_edges, font_size=9)
 
     title = f"Course Overlap Network (Top {TOP_N} Courses) | Edge>= {MIN_EDGE} common students"
@@ -86,10 +100,10 @@ def main():
     plt.close()
 
     # Print quick ranking of most overlapping pairs
-    top_pairs = sorted(overlap.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_pairs = overlap.nlargest(10)
     print(f"✅ Saved: {out_path}")
     print("\nTop 10 overlaps (pair -> common students):")
-    for (a, b), w in top_pairs:
+    for (a, b), w in top_pairs.items():
         print(f"{a} - {b}: {w}")
 
 if __name__ == "__main__":
@@ -1,8 +1,18 @@
 
+import hashlib
+import json
+import os
+import re
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from zipfile import ZipFile
+from lxml import etree
 from docx import Document
+from docx.opc import phys_pkg
 from docx.shared import Pt
+from docx.oxml import OxmlElement, parse_xml
 from docx.oxml.ns import qn
 
 # ===============================
@@ -12,6 +22,17 @@ from docx.oxml.ns import qn
 PROJECT_ROOT = Path(".")
 SRC_DIR = PROJECT_ROOT / "src"
 OUTPUT_PATH = PROJECT_ROOT / "outputs" / "WAI_Code_Appendix.docx"
+CACHE_DIR = PROJECT_ROOT / "outputs" / "appendix_cache"   # rendered code blocks, one file per source text
+MANIFEST_PATH = CACHE_DIR / "manifest.json"                # render settings + source file -> (mtime, size, cached blocks)
+
+# Deflate level for the saved .docx (python-docx always uses zlib's default 6).
+# 1 keeps the save fast; set WAIOR_COMPRESS_LEVEL=9 for the smallest file in a distribution build.
+COMPRESS_LEVEL = int(os.getenv("WAIOR_COMPRESS_LEVEL", "").strip() or 1)
+
+CODE_FONT = "Consolas"
+CODE_SIZE = 9
+CODE_CHUNK_LINES = 2000   # longer sources are split over several code paragraphs
+RUN_BREAKS = re.compile(r"([\t\r\n])")   # characters that become <w:tab/>/<w:br/> in a run
 
 # Update filenames here if needed
 MODULES = [
@@ -71,17 +92,143 @@ def set_document_style(doc):
     rFonts.set(qn("w:ascii"), "Times New Roman")
     rFonts.set(qn("w:hAnsi"), "Times New Roman")
 
-def add_code_block(doc, code_text):
-    paragraph = doc.add_paragraph()
-    run = paragraph.add_run(code_text)
-    run.font.name = "Consolas"
-    run.font.size = Pt(9)
+def add_run_text(r, text):
+    """
+    Fill a <w:r> with text the way python-docx's add_run does (a <w:t> per
+    line, <w:br/>/<w:tab/> in between), without its per-character loop.
+    """
+    for piece in RUN_BREAKS.split(text):
+        if piece == "\t":
+            etree.SubElement(r, qn("w:tab"))
+        elif piece in ("\r", "\n"):
+            etree.SubElement(r, qn("w:br"))
+        elif piece:
+            t = etree.SubElement(r, qn("w:t"))
+            t.text = piece
+            if piece != piece.strip():
+                t.set(qn("xml:space"), "preserve")
+
+def text_paragraph(text, style=None):
+    """Detached <w:p> with one run of text, optionally in a paragraph style (style id, e.g. "Heading2")."""
+    p = OxmlElement("w:p")
+    if style is not None:
+        pPr = etree.SubElement(p, qn("w:pPr"))
+        etree.SubElement(pPr, qn("w:pStyle"), {qn("w:val"): style})
+    add_run_text(etree.SubElement(p, qn("w:r")), text)
+    return p
+
+def page_break_paragraph():
+    """Detached <w:p> holding just a page break, as doc.add_page_break writes it."""
+    p = OxmlElement("w:p")
+    r = etree.SubElement(p, qn("w:r"))
+    etree.SubElement(r, qn("w:br"), {qn("w:type"): "page"})
+    return p
+
+def code_paragraph(code_text):
+    """One detached code paragraph holding the whole file."""
+    p = OxmlElement("w:p")
+    r = etree.SubElement(p, qn("w:r"))
+    rPr = etree.SubElement(r, qn("w:rPr"))
+    etree.SubElement(rPr, qn("w:rFonts"), {qn("w:ascii"): CODE_FONT, qn("w:hAnsi"): CODE_FONT})
+    etree.SubElement(rPr, qn("w:sz"), {qn("w:val"): str(CODE_SIZE * 2)})  # half-points
+    add_run_text(r, code_text)
+    return p
+
+def code_chunks(code_text):
+    """Code text cut into blocks of at most CODE_CHUNK_LINES lines, one paragraph each."""
+    lines = code_text.split("\n")
+    return ["\n".join(lines[i:i + CODE_CHUNK_LINES]) for i in range(0, len(lines), CODE_CHUNK_LINES)]
+
+def cached_code_paragraph(code_text):
+    """
+    code_paragraph, reusing the rendered <w:p> from disk when the same
+    text (in the same font and size) was rendered before.
+    Returns (paragraph, cache file path).
+    """
+    key = f"{CODE_FONT}|{CODE_SIZE}|{code_text}"
+    path = CACHE_DIR / f"code_{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}.xml"
+    if path.exists():
+        return parse_xml(path.read_bytes()), path
+
+    p = code_paragraph(code_text)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(etree.tostring(p))
+    return p, path
+
+def unchanged_code_cache(manifest, name, st):
+    """
+    Cached code block files of a source whose mtime and size still match
+    the manifest (so it need not even be read), else None.
+    """
+    entry = manifest.get(name)
+    if st is None or entry is None or (entry["mtime_ns"], entry["size"]) != (st.st_mtime_ns, st.st_size):
+        return None
+    paths = [CACHE_DIR / block for block in entry.get("blocks", [])]
+    return paths if paths and all(p.exists() for p in paths) else None
 
-    r = run._element
-    rPr = r.get_or_add_rPr()
-    rFonts = rPr.get_or_add_rFonts()
-    rFonts.set(qn("w:ascii"), "Consolas")
-    rFonts.set(qn("w:hAnsi"), "Consolas")
+def render_settings():
+    """Everything a cached code block depends on besides the source text."""
+    return {"font": CODE_FONT, "size": CODE_SIZE, "chunk_lines": CODE_CHUNK_LINES}
+
+def read_manifest():
+    """Manifest entries per source file; empty if there is none or it was written with other render settings."""
+    if not MANIFEST_PATH.exists():
+        return {}
+    manifest = json.loads(MANIFEST_PATH.read_text())
+    if manifest.get("settings") != render_settings():
+        return {}
+    return manifest.get("modules", {})
+
+def write_manifest(entries):
+    """Save the manifest and delete cached blocks that no entry refers to any more."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(json.dumps({"settings": render_settings(), "modules": entries}, indent=2))
+    keep = {block for entry in entries.values() for block in entry["blocks"]}
+    for path in CACHE_DIR.glob("code_*.xml"):
+        if path.name not in keep:
+            path.unlink()
+
+def module_paragraphs(module, file_path, code):
+    """
+    All paragraphs of one module's page: break, heading, purpose, then the
+    code paragraphs (or a missing-file note if code is None).
+    """
+    paragraphs = [
+        page_break_paragraph(),
+        text_paragraph(module["title"], style="Heading2"),
+        text_paragraph("Purpose:"),
+        text_paragraph(module["description"]),
+    ]
+    if code is None:
+        paragraphs.append(text_paragraph(f"⚠ ERROR: File not found → {file_path}"))
+    else:
+        paragraphs += [text_paragraph("Code:"), *code]
+    return paragraphs
+
+def append_paragraphs(doc, paragraphs):
+    """Insert detached paragraphs at the end of the body (before its sectPr) in one slice assignment."""
+    body = doc.element.body
+    end = body.index(body.sectPr)
+    body[end:end] = paragraphs
+
+def save_docx(doc, path, compresslevel=COMPRESS_LEVEL):
+    """
+    doc.save at a chosen deflate level. python-docx has no option for it,
+    so its ZipFile is swapped for one with compresslevel set for this save only.
+    """
+    original = phys_pkg.ZipFile
+    phys_pkg.ZipFile = partial(ZipFile, compresslevel=compresslevel)
+    try:
+        doc.save(path)
+    finally:
+        phys_pkg.ZipFile = original
+
+def read_source(file_path):
+    """Source text of one module, or None if the file is missing."""
+    if not file_path.exists():
+        return None
+    # One read and one decode; only CRLF needs normalizing for the docx run
+    return file_path.read_bytes().decode("utf-8", "ignore").replace("\r\n", "\n")
 
 # ===============================
 # MAIN LOGIC
@@ -89,34 +236,48 @@ def add_code_block(doc, code_text):
 
 def main():
     doc = Document()
+    # Fail on an unwritable output folder now, not after the whole document is built
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     set_document_style(doc)
 
+    generated_on = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
     doc.add_heading("WAI Timetable Optimization — Code Appendix", level=1)
-    doc.add_paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    doc.add_paragraph(f"Generated on: {generated_on}")
     doc.add_paragraph(
         "This appendix contains the primary Python modules used in the timetable optimization pipeline."
     )
 
-    for module in MODULES:
-        doc.add_page_break()
-        doc.add_heading(module["title"], level=2)
-
-        file_path = SRC_DIR / module["file"]
-
-        doc.add_paragraph("Purpose:")
-        doc.add_paragraph(module["description"])
+    # Sources unchanged since the last run (same mtime and size) reuse their cached block unread
+    file_paths = [SRC_DIR / m["file"] for m in MODULES]
+    stats = [p.stat() if p.exists() else None for p in file_paths]
+    manifest = read_manifest()
+    reuse = [unchanged_code_cache(manifest, m["file"], st) for m, st in zip(MODULES, stats)]
 
-        if not file_path.exists():
-            doc.add_paragraph(f"⚠ ERROR: File not found → {file_path}")
-            continue
+    # Read the rest up front, in parallel, so the loop below only builds the docx
+    stale = [p for p, st, hit in zip(file_paths, stats, reuse) if st is not None and hit is None]
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(stale)))) as ex:
+        texts = dict(zip(stale, ex.map(read_source, stale)))
 
-        code_text = file_path.read_text(encoding="utf-8", errors="ignore")
+    entries = {}  # only the current modules, so blocks of removed or edited sources get pruned
+    for module, file_path, st, hit in zip(MODULES, file_paths, stats, reuse):
+        code = None
+        if hit is not None:
+            code = [parse_xml(path.read_bytes()) for path in hit]
+            entries[module["file"]] = manifest[module["file"]]
+        elif texts.get(file_path) is not None:
+            blocks = [cached_code_paragraph(chunk) for chunk in code_chunks(texts[file_path])]
+            code = [p for p, _ in blocks]
+            entries[module["file"]] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "blocks": [path.name for _, path in blocks],
+            }
+        append_paragraphs(doc, module_paragraphs(module, file_path, code))
 
-        doc.add_paragraph("Code:")
-        add_code_block(doc, code_text)
+    write_manifest(entries)
 
-    OUTPUT_PATH.parent.mkdir(exist_ok=True)
-    doc.save(OUTPUT_PATH)
+    save_docx(doc, OUTPUT_PATH)
 
     print(f"\n✅ Code appendix generated at:\n{OUTPUT_PATH.resolve()}")
 
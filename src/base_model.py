@@ -0,0 +1,225 @@
+import sys
+import numpy as np
+from pathlib import Path
+from ortools.sat.python import cp_model
+
+
+def add_at_most_one(model, lits):
+    """AtMostOne over lits; a pair is posted as the single clause a => not b."""
+    if len(lits) == 2:
+        model.AddImplication(lits[0], lits[1].Not())
+    else:
+        model.AddAtMostOne(lits)
+
+
+def faculty_groups(faculty_of_row) -> list:
+    """Row indexes of X grouped by faculty (first-seen order), from one faculty key per section row."""
+    groups = {}
+    for i, fac in enumerate(faculty_of_row):
+        groups.setdefault(fac, []).append(i)
+    return list(groups.values())
+
+
+def ctx_faculty_sets(ctx) -> list:
+    """The single faculty map of ctx.faculty_to_sections, as X row groups (see build_base_model)."""
+    sec_idx = {sec: i for i, sec in enumerate(ctx.section_ids)}
+    return [[[sec_idx[sec] for sec in secs] for secs in ctx.faculty_to_sections.values()]]
+
+
+def student_bundle_rows(ctx, sec_idx) -> list:
+    """X rows of every distinct student section bundle (students with the same sections share one)."""
+    student_bundles = {tuple(sorted(set(secs))) for secs in ctx.student_to_sections.values() if len(set(secs)) > 1}
+    return [[sec_idx[sec] for sec in secs] for secs in sorted(student_bundles)]
+
+
+def build_base_model(ctx, faculty_sets=None, slot_faculty_set=None):
+    """
+    CP-SAT core shared by the 11-16/44/45 timetable models:
+    X[i, j] = section i meets in slot j, room capacity per slot, and one
+    AtMostOne per slot for every distinct student section bundle and for
+    every faculty teaching more than one section.
+
+    faculty_sets is a list of faculty maps, each a list of X row groups
+    (one per faculty, singletons included; see faculty_groups). It defaults
+    to ctx.faculty_to_sections. With several maps (e.g. pre/post-mid
+    faculty), slot_faculty_set[j] is the index of the map slot j uses.
+    At most one section per faculty meets in a slot, so rooms that fit
+    every faculty get no capacity row.
+
+    Returns (model, X, sec_idx); each script adds its own per-section
+    bounds and objective on top.
+    """
+    section_ids, slot_ids = ctx.section_ids, ctx.slot_ids
+    model = cp_model.CpModel()
+
+    # X[i, j] = section i meets in slot j (unnamed vars: no per-var f-string)
+    sec_idx = {sec: i for i, sec in enumerate(section_ids)}
+    X = np.empty((len(section_ids), len(slot_ids)), dtype=object)
+    X.flat[:] = [model.NewBoolVar("") for _ in range(X.size)]
+
+    if faculty_sets is None:
+        faculty_sets = ctx_faculty_sets(ctx)
+    if slot_faculty_set is None:
+        slot_faculty_set = [0] * len(slot_ids)
+
+    # Room capacity (skipped where it can never bind)
+    max_concurrent = max(len(groups) for groups in faculty_sets)
+    skipped = 0
+    for j, sl in enumerate(slot_ids):
+        cap = int(ctx.slot_capacity[sl])
+        if cap >= max_concurrent:
+            skipped += 1
+            continue
+        model.Add(cp_model.LinearExpr.Sum(X[:, j].tolist()) <= cap)
+    print(f"Room capacity rows: {len(slot_ids) - skipped} posted, {skipped} skipped (capacity >= {max_concurrent})")
+
+    # Student conflict
+    for rows in student_bundle_rows(ctx, sec_idx):
+        sub = X[rows, :]
+        for j in range(len(slot_ids)):
+            add_at_most_one(model, sub[:, j].tolist())
+
+    # Faculty conflict, per slot against the faculty map that slot uses
+    for k, groups in enumerate(faculty_sets):
+        cols = [j for j, s in enumerate(slot_faculty_set) if s == k]
+        for rows in groups:
+            if len(rows) <= 1:
+                continue
+            sub = X[rows, :]
+            for j in cols:
+                add_at_most_one(model, sub[:, j].tolist())
+
+    return model, X, sec_idx
+
+
+def solution_matrix(solver, X) -> np.ndarray:
+    """Solved values of X as an int array, read from the response in one pass instead of per-cell Value calls."""
+    sol = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+    idx = np.fromiter((v.Index() for v in X.flat), dtype=np.int64, count=X.size)
+    return sol[idx].reshape(X.shape)
+
+
+def hint_path(output_dir: Path, variant: str) -> Path:
+    return output_dir / "hints" / f"{variant}.npz"
+
+
+def save_hint(output_dir: Path, variant: str, section_ids, slot_ids, values: np.ndarray):
+    """Keep a solved X (0/1 matrix) so the other variants can start from it."""
+    path = hint_path(output_dir, variant)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, section_ids=np.array(section_ids), slot_ids=np.array(slot_ids), x=values.astype(np.int8))
+
+
+def add_hint(model, X, output_dir: Path, variant: str, section_ids, slot_ids) -> bool:
+    """
+    Warm-start X from a saved variant solution. Only a hint, never fixed;
+    skipped if the file is missing or was solved on other sections/slots.
+    """
+    path = hint_path(output_dir, variant)
+    if not path.exists():
+        print(f"No hint found at {path}")
+        return False
+    saved = np.load(path)
+    if saved["section_ids"].tolist() != list(section_ids) or saved["slot_ids"].tolist() != list(slot_ids):
+        print(f"⚠️ Hint {path} is for a different section/slot set, ignoring")
+        return False
+    for var, value in zip(X.flat, saved["x"].flat):
+        model.AddHint(var, int(value))
+    print(f"Hint loaded from {path}")
+    return True
+
+
+def greedy_hint(targets, col_capacity, group_sets, col_group_set) -> np.ndarray:
+    """
+    Quick feasible 0/1 matrix to warm-start CP-SAT with (see add_matrix_hint).
+
+    Rows are filled largest target first, each taking the earliest columns
+    that still have capacity and where none of its conflict groups is used
+    yet. group_sets is a list of row-group lists (e.g. student bundles plus
+    one faculty map); column j is checked against group_sets[col_group_set[j]].
+    """
+    n_rows, n_cols = len(targets), len(col_capacity)
+    hint = np.zeros((n_rows, n_cols), dtype=np.int8)
+    room_left = np.asarray(col_capacity, dtype=np.int64).copy()
+
+    # Group ids per row for each group set, and one "used" flag per (group, column)
+    row_groups = []
+    n_groups = 0
+    for groups in group_sets:
+        by_row = [[] for _ in range(n_rows)]
+        for rows in groups:
+            for r in rows:
+                by_row[r].append(n_groups)
+            n_groups += 1
+        row_groups.append(by_row)
+    used = np.zeros((n_groups, n_cols), dtype=bool)
+
+    for r in sorted(range(n_rows), key=lambda r: -targets[r]):
+        left = int(targets[r])
+        for j in range(n_cols):
+            if left == 0:
+                break
+            gids = row_groups[col_group_set[j]][r]
+            if room_left[j] <= 0 or used[gids, j].any():
+                continue
+            hint[r, j] = 1
+            room_left[j] -= 1
+            used[gids, j] = True
+            left -= 1
+    return hint
+
+
+def add_matrix_hint(model, X, values: np.ndarray):
+    """Hint every cell of X with the matching 0/1 value."""
+    for var, value in zip(X.flat, values.flat):
+        model.AddHint(var, int(value))
+
+
+def add_symmetry_breaking(model, X, section_ids, student_to_sections, faculty_of) -> int:
+    """
+    Sections with the same faculty and exactly the same students are
+    interchangeable rows of X; order their session counts so CP-SAT does
+    not explore every permutation. faculty_of maps section_id -> hashable
+    faculty key. Returns the number of groups ordered.
+    """
+    section_students = {}
+    for sid, secs in student_to_sections.items():
+        for sec in secs:
+            section_students.setdefault(sec, []).append(sid)
+
+    groups = {}
+    for i, sec in enumerate(section_ids):
+        key = (faculty_of[sec], tuple(sorted(section_students.get(sec, []))))
+        groups.setdefault(key, []).append(i)
+
+    n_groups = 0
+    for rows in groups.values():
+        if len(rows) <= 1:
+            continue
+        n_groups += 1
+        for a, b in zip(rows, rows[1:]):
+            model.Add(cp_model.LinearExpr.Sum(X[a, :].tolist()) >= cp_model.LinearExpr.Sum(X[b, :].tolist()))
+    print("Symmetric section groups ordered:", n_groups)
+    return n_groups
+
+
+def maybe_break_symmetry(model, X, ctx, faculty_sets=None, argv=None) -> int:
+    """
+    add_symmetry_breaking, only when the script is run with --symmetry-break
+    (off by default until it is benchmarked). A section's faculty key is its
+    group in every faculty map (faculty_sets as in build_base_model), so
+    sections of a split course only match with the same pre- and post-mid
+    faculty. Returns the number of groups ordered.
+    """
+    if "--symmetry-break" not in (sys.argv if argv is None else argv):
+        return 0
+    if faculty_sets is None:
+        faculty_sets = ctx_faculty_sets(ctx)
+
+    keys = [[] for _ in ctx.section_ids]
+    for groups in faculty_sets:
+        for g, rows in enumerate(groups):
+            for r in rows:
+                keys[r].append(g)
+    faculty_of = {sec: tuple(key) for sec, key in zip(ctx.section_ids, keys)}
+    return add_symmetry_breaking(model, X, ctx.section_ids, ctx.student_to_sections, faculty_of)
@@ -0,0 +1,249 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from pathlib import Path
+
+
+# Courses whose faculty changes at the midterm (faculty_raw in courses.csv is left as is).
+# 42 writes these to outputs/courses_faculty_overrides.csv; 44 reads that file, or these if it is missing.
+FACULTY_OVERRIDES = [
+    {"course_id": "DTI", "faculty_premid": "Prof. Rohit Kumar", "faculty_postmid": "Prof. Rogers"},
+]
+FACULTY_OVERRIDE_COLS = ["course_id", "faculty_premid", "faculty_postmid"]
+
+
+def parquet_path(csv_path: Path) -> Path:
+    return csv_path.with_suffix(".parquet")
+
+
+def fresh_parquet(csv_path: Path):
+    """
+    Return the Parquet copy of csv_path if it is at least as new as the
+    CSV (so a hand-edited CSV still wins), else None.
+    """
+    pq_path = parquet_path(csv_path)
+    if pq_path.exists() and (not csv_path.exists() or pq_path.stat().st_mtime >= csv_path.stat().st_mtime):
+        return pq_path
+    return None
+
+
+def write_table(df: pd.DataFrame, csv_path: Path):
+    """
+    Save a pipeline table as CSV (for people / Excel) plus a typed
+    Parquet copy next to it (for the downstream scripts).
+    """
+    df.to_csv(csv_path, index=False)
+    df.to_parquet(parquet_path(csv_path), engine="pyarrow", compression="zstd", index=False)
+
+
+def read_table(csv_path: Path, str_cols=()) -> pd.DataFrame:
+    """
+    Load a pipeline table, preferring the fresh Parquet copy.
+
+    Parquet columns are already typed and stripped at write time. On the
+    CSV fallback, str_cols are cast to str and stripped like the scripts
+    used to do inline.
+    """
+    pq_path = fresh_parquet(csv_path)
+    if pq_path is not None:
+        df = pd.read_parquet(pq_path, engine="pyarrow")
+        for col in str_cols:
+            if col in df.columns:
+                assert pd.api.types.is_string_dtype(df[col]), f"{pq_path}: {col} is not a string column"
+        return df
+
+    return read_csv_table(csv_path, str_cols).to_pandas()
+
+
+def read_csv_table(csv_path: Path, str_cols=()) -> pa.Table:
+    """
+    Multithreaded Arrow CSV read. str_cols are read as strings (blank/NA
+    cells become "nan", as astype(str) used to give) and trimmed in Arrow.
+    Other columns keep pandas' typing: numbers are inferred, times like
+    "09:00" stay text and all-blank columns come back as float NaN.
+    """
+    # Types inferred from the first block only, to pin the ones pandas would not infer
+    with pacsv.open_csv(csv_path) as reader:
+        sniffed = reader.schema
+    column_types = {}
+    for field in sniffed:
+        if field.name in str_cols or pa.types.is_temporal(field.type):
+            column_types[field.name] = pa.string()
+        elif pa.types.is_null(field.type):
+            column_types[field.name] = pa.float64()
+
+    tbl = pacsv.read_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(use_threads=True),
+        convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+    )
+    for col in str_cols:
+        if col not in tbl.column_names:
+            continue
+        trimmed = pc.utf8_trim_whitespace(pc.fill_null(tbl.column(col), "nan"))
+        tbl = tbl.set_column(tbl.column_names.index(col), col, trimmed)
+    return tbl
+
+
+def read_arrow_table(csv_path: Path, str_cols=()) -> pa.Table:
+    """Same as read_table, but returns a pyarrow Table (no pandas copy on the Parquet path)."""
+    pq_path = fresh_parquet(csv_path)
+    if pq_path is not None:
+        return pq.read_table(pq_path)
+    return read_csv_table(csv_path, str_cols)
+
+
+def write_arrow_table(tbl: pa.Table, csv_path: Path):
+    """
+    Same as write_table, for a pyarrow Table. The CSV is laid out like
+    pandas' to_csv (values unquoted) unless a string holds a comma, quote
+    or line break; then string values are quoted so the file stays valid.
+    """
+    needs_quotes = any(
+        pc.any(pc.match_substring_regex(tbl.column(name), r'[,"\r\n]')).as_py()
+        for name, typ in zip(tbl.column_names, tbl.schema.types)
+        if pa.types.is_string(typ) or pa.types.is_large_string(typ)
+    )
+    quoting = "needed" if needs_quotes else "none"
+
+    # CSV first, so the Parquet copy is the newer file and fresh_parquet picks it up
+    with open(csv_path, "wb") as f:
+        f.write((",".join(tbl.column_names) + "\n").encode("utf-8"))
+        pacsv.write_csv(tbl, f, pacsv.WriteOptions(include_header=False, quoting_style=quoting))
+    pq.write_table(tbl, parquet_path(csv_path), compression="zstd")
+
+
+def group_lists(keys, values) -> dict:
+    """
+    {key: [values...]} with keys in sorted order, like groupby(keys).agg(list),
+    but as one stable argsort and a split at the key boundaries.
+    """
+    keys = np.asarray(keys)
+    values = np.asarray(values)
+    if len(keys) == 0:
+        return {}
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    return {key: chunk.tolist() for key, chunk in zip(keys[np.r_[0, bounds]].tolist(), np.split(values, bounds))}
+
+
+def read_faculty_overrides(csv_path: Path) -> pd.DataFrame:
+    """
+    Midterm faculty overrides indexed by course_id, from the sidecar CSV 42
+    writes, or FACULTY_OVERRIDES if it is missing. Blank ("nan") cells are
+    NaN, i.e. no override for that half; a course listed twice is an error.
+    """
+    if csv_path.exists():
+        ov = read_table(csv_path, FACULTY_OVERRIDE_COLS)
+    else:
+        print(f"{csv_path} not found, using the built-in faculty overrides")
+        ov = pd.DataFrame(FACULTY_OVERRIDES, columns=FACULTY_OVERRIDE_COLS)
+
+    dup = ov.loc[ov["course_id"].duplicated(), "course_id"].unique().tolist()
+    if dup:
+        raise ValueError(f"{csv_path}: course_id listed more than once: {', '.join(dup)}")
+
+    for col in FACULTY_OVERRIDE_COLS[1:]:
+        blank = ov[col].isna() | ov[col].astype(str).str.strip().isin(["", "nan"])
+        ov[col] = ov[col].mask(blank)
+    return ov.set_index("course_id")
+
+
+class ScheduleInputs(NamedTuple):
+    """Tables and lookup dicts shared by the timetable models (11-14, 43-45)."""
+    sections: pd.DataFrame
+    enroll: pd.DataFrame
+    courses: pd.DataFrame
+    slots: pd.DataFrame
+    section_ids: list
+    slot_ids: list
+    weeks: list
+    sec_to_course: dict
+    course_to_faculty: dict
+    student_to_sections: dict
+    faculty_to_sections: dict
+    slot_capacity: dict
+    slot_to_week: dict
+    slots_by_week: dict
+
+
+def cached_table(csv_path: Path, str_cols=()) -> pd.DataFrame:
+    """read_table, writing the Parquet copy on a CSV read so the next script skips the parse."""
+    df = read_table(csv_path, str_cols)
+    if fresh_parquet(csv_path) is None:
+        df.to_parquet(parquet_path(csv_path), engine="pyarrow", compression="zstd", index=False)
+    return df
+
+
+@lru_cache(maxsize=None)
+def _memo_table(csv_path: Path, str_cols: tuple, mtime_ns: int) -> pd.DataFrame:
+    return cached_table(csv_path, str_cols)
+
+
+def memo_table(csv_path: Path, str_cols=()) -> pd.DataFrame:
+    """
+    cached_table, memoized in-process on (path, CSV mtime) so dashboard
+    panels that share a table read it once. Returns a copy, so callers can
+    rename or add columns freely.
+    """
+    mtime_ns = csv_path.stat().st_mtime_ns if csv_path.exists() else 0
+    return _memo_table(csv_path, tuple(str_cols), mtime_ns).copy()
+
+
+@lru_cache(maxsize=None)
+def load_inputs(output_dir: Path) -> ScheduleInputs:
+    """
+    Load sections / enrollments / courses / slots once and build the
+    lookups every model script starts from. Cached per output_dir.
+    """
+    sections = cached_table(output_dir / "sections.csv", ["section_id", "course_id"])
+    enroll = cached_table(output_dir / "section_enrollments.csv", ["section_id", "student_id"])
+    courses = cached_table(output_dir / "courses.csv", ["course_id", "faculty_raw", "faculty", "faculty_name"])
+    slots = cached_table(output_dir / "slots.csv", ["slot_id", "day"])
+
+    # Faculty column detect
+    faculty_col = next((c for c in ["faculty_raw", "faculty", "faculty_name"] if c in courses.columns), None)
+    if faculty_col is None:
+        raise ValueError("No faculty column found in courses.csv")
+
+    # Room capacity column name handling
+    cap_col = next((c for c in ["room_capacity", "room_cap"] if c in slots.columns), None)
+    if cap_col is None:
+        raise ValueError("slots.csv must have room_capacity or room_cap column")
+
+    slots["week"] = slots["week"].astype(int)
+    slots[cap_col] = slots[cap_col].astype(int)
+
+    section_ids = sections["section_id"].unique().tolist()
+    slot_ids = slots["slot_id"].unique().tolist()
+    weeks = sorted(slots["week"].unique().tolist())
+
+    sec_to_course = dict(zip(sections["section_id"], sections["course_id"]))
+    course_to_faculty = dict(zip(courses["course_id"], courses[faculty_col]))
+
+    # student -> sections
+    student_to_sections = group_lists(enroll["student_id"].to_numpy(), enroll["section_id"].to_numpy())
+
+    # faculty -> sections, in section order
+    sec_fac = pd.Series(section_ids).map(sec_to_course).map(course_to_faculty)
+    if sec_fac.isna().any():
+        raise ValueError("Sections found for courses missing from courses.csv")
+    faculty_to_sections = pd.Series(section_ids).groupby(sec_fac.to_numpy(), sort=False).agg(list).to_dict()
+
+    slot_capacity = dict(zip(slots["slot_id"], slots[cap_col]))
+    slot_to_week = dict(zip(slots["slot_id"], slots["week"]))
+    slots_by_week = slots.groupby("week", sort=True)["slot_id"].agg(list).to_dict()
+
+    return ScheduleInputs(
+        sections, enroll, courses, slots,
+        section_ids, slot_ids, weeks,
+        sec_to_course, course_to_faculty, student_to_sections, faculty_to_sections,
+        slot_capacity, slot_to_week, slots_by_week,
+    )
@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+from ortools.sat.python import cp_model
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "").strip()
+    return int(value) if value else default
+
+
+def pick_workers(n_bool_vars: int) -> int:
+    """
+    Worker count by model size: extra workers only help once there is enough
+    search to share, and can make small models slower.
+    """
+    if n_bool_vars < 10_000:
+        return 4
+    if n_bool_vars < 100_000:
+        return 8
+    return 16
+
+
+def configure_solver(solver, workers: int = 8, seed: int = 1, time_limit: float = 240, **extra):
+    """
+    Common CP-SAT parameters for the timetable models.
+
+    The script's own defaults can be overridden per run without editing it:
+      WAIOR_WORKERS, WAIOR_TIME_LIMIT (seconds), WAIOR_SEED, WAIOR_LOG=1
+    Any extra keyword is set as a SatParameters field as is
+    (e.g. linearization_level=2, relative_gap_limit=0.01).
+    The final settings are printed so runs can be compared.
+    """
+    params = solver.parameters
+    params.num_search_workers = env_int("WAIOR_WORKERS", workers)
+    params.random_seed = env_int("WAIOR_SEED", seed)
+    params.max_time_in_seconds = float(env_int("WAIOR_TIME_LIMIT", int(time_limit)))
+    params.log_search_progress = bool(env_int("WAIOR_LOG", 0))
+    for name, value in extra.items():
+        setattr(params, name, value)
+
+    print(
+        f"Solver: workers={params.num_search_workers} seed={params.random_seed} "
+        f"time_limit={params.max_time_in_seconds:g}s log={params.log_search_progress}"
+        + "".join(f" {name}={value}" for name, value in extra.items())
+    )
+    return solver
+
+
+def write_solve_stats(solver, output_dir: Path, name: str):
+    """Save the solver's ResponseStats to outputs/logs/<name>.txt so runs can be compared later."""
+    log_dir = output_dir / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    path = log_dir / f"{name}.txt"
+    params = solver.parameters
+    path.write_text(
+        f"workers={params.num_search_workers} seed={params.random_seed} "
+        f"time_limit={params.max_time_in_seconds:g}s\n\n{solver.ResponseStats()}\n"
+    )
+    print("Solve stats:", path)
+
+
+class StopAtBound(cp_model.CpSolverSolutionCallback):
+    """Stop the search as soon as a solution reaches a known objective upper bound."""
+
+    def __init__(self, upper_bound: int):
+        super().__init__()
+        self.upper_bound = upper_bound
+
+    def on_solution_callback(self):
+        if round(self.ObjectiveValue()) >= self.upper_bound:
+            print(f"Objective reached its upper bound {self.upper_bound}, stopping early")
+            self.StopSearch()
+
+
+def solve_to_bound(solver, model, upper_bound: int):
+    """
+    Solve a maximization, stopping early if a solution hits upper_bound
+    (e.g. sections * CAP) instead of running out the time limit.
+    """
+    return solver.Solve(model, StopAtBound(upper_bound))
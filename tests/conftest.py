@@ -0,0 +1,26 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# The pipeline scripts import their helpers (data_io, ...) straight from src/
+sys.path.insert(0, str(SRC_DIR))
+
+
+@pytest.fixture(scope="session")
+def load_script():
+    """Import a numbered pipeline script (e.g. "02c_sectioning_ilp") as a module, without running main."""
+    loaded = {}
+
+    def load(name):
+        if name not in loaded:
+            spec = importlib.util.spec_from_file_location(f"script_{name}", SRC_DIR / f"{name}.py")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            loaded[name] = module
+        return loaded[name]
+
+    return load
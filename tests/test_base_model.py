@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from ortools.sat.python import cp_model
+
+from base_model import faculty_groups, greedy_hint, maybe_break_symmetry
+
+
+def _ctx():
+    # A1/A2 share faculty and students; B has its own faculty
+    return SimpleNamespace(
+        section_ids=["A1", "A2", "B"],
+        student_to_sections={"s1": ["A1", "A2"], "s2": ["A1", "A2", "B"]},
+        faculty_to_sections={"Prof. A": ["A1", "A2"], "Prof. B": ["B"]},
+    )
+
+
+def _bool_matrix(model, n_rows, n_cols):
+    X = np.empty((n_rows, n_cols), dtype=object)
+    X.flat[:] = [model.NewBoolVar("") for _ in range(X.size)]
+    return X
+
+
+def test_maybe_break_symmetry_needs_the_flag():
+    model = cp_model.CpModel()
+    X = _bool_matrix(model, 3, 2)
+    assert maybe_break_symmetry(model, X, _ctx(), argv=[]) == 0
+    assert len(model.Proto().constraints) == 0
+
+
+def test_maybe_break_symmetry_orders_identical_sections():
+    model = cp_model.CpModel()
+    X = _bool_matrix(model, 3, 2)
+    assert maybe_break_symmetry(model, X, _ctx(), argv=["--symmetry-break"]) == 1
+    assert len(model.Proto().constraints) == 1
+
+
+def test_maybe_break_symmetry_uses_every_faculty_map():
+    # Same pre-mid faculty, different post-mid faculty: not interchangeable
+    model = cp_model.CpModel()
+    X = _bool_matrix(model, 3, 2)
+    faculty_sets = [
+        faculty_groups(["Prof. A", "Prof. A", "Prof. B"]),
+        faculty_groups(["Prof. A", "Prof. C", "Prof. B"]),
+    ]
+    assert maybe_break_symmetry(model, X, _ctx(), faculty_sets, argv=["--symmetry-break"]) == 0
+
+
+def _check_hint(hint, targets, col_capacity, group_sets, col_group_set):
+    assert set(np.unique(hint)) <= {0, 1}
+    assert (hint.sum(axis=1) <= np.asarray(targets)).all()
+    assert (hint.sum(axis=0) <= np.asarray(col_capacity)).all()
+    for j, k in enumerate(col_group_set):
+        for rows in group_sets[k]:
+            assert hint[rows, j].sum() <= 1, (j, rows)
+
+
+def test_greedy_hint_small_case():
+    # 4 sections, 3 slots of 2 rooms; rows 0/1 share students, rows 2/3 share
+    # faculty before the midterm (slots 0-1) and rows 1/2 after it (slot 2)
+    targets = [2, 2, 2, 1]
+    col_capacity = [2, 2, 2]
+    bundles = [[0, 1]]
+    group_sets = [bundles + [[2, 3], [0], [1]], bundles + [[1, 2], [0], [3]]]
+    col_group_set = [0, 0, 1]
+
+    hint = greedy_hint(targets, col_capacity, group_sets, col_group_set)
+
+    _check_hint(hint, targets, col_capacity, group_sets, col_group_set)
+    assert hint.sum(axis=1).tolist() == [2, 1, 2, 1]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_greedy_hint_random_respects_constraints(seed):
+    rng = np.random.default_rng(seed)
+    n_rows, n_cols = 12, 20
+    targets = rng.integers(0, 8, size=n_rows).tolist()
+    col_capacity = rng.integers(0, 5, size=n_cols).tolist()
+    bundles = [sorted(rng.choice(n_rows, size=3, replace=False).tolist()) for _ in range(5)]
+    group_sets = [
+        bundles + faculty_groups(rng.integers(0, 4, size=n_rows).tolist()),
+        bundles + faculty_groups(rng.integers(0, 4, size=n_rows).tolist()),
+    ]
+    col_group_set = [int(j >= n_cols // 2) for j in range(n_cols)]
+
+    hint = greedy_hint(targets, col_capacity, group_sets, col_group_set)
+
+    assert hint.shape == (n_rows, n_cols)
+    _check_hint(hint, targets, col_capacity, group_sets, col_group_set)
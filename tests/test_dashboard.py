@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+DTI_FACULTY = "Prof. Rohit Kumar (Premid) + Prof. Rojers Puthur Josrph (Postmid)"
+
+
+@pytest.fixture(scope="module")
+def dashboard(load_script):
+    return load_script("90_dashboard")
+
+
+def _parse(dashboard, rows):
+    course_ids, weeks, faculty_raw = zip(*rows)
+    return dashboard.parse_faculty_for_course(
+        pd.Series(course_ids, dtype="str"), pd.Series(weeks), pd.Series(faculty_raw, dtype="str"),
+    ).tolist()
+
+
+def test_dti_switches_faculty_after_the_midterm_week(dashboard):
+    mid = dashboard.MIDTERM_WEEK
+    got = _parse(dashboard, [("DTI", 1, DTI_FACULTY), ("DTI", mid, DTI_FACULTY), ("DTI", mid + 1, DTI_FACULTY)])
+
+    assert got == [
+        "Prof. Rohit Kumar (Premid)",
+        "Prof. Rohit Kumar (Premid)",
+        "Prof. Rojers Puthur Josrph (Postmid)",
+    ]
+
+
+def test_other_courses_keep_their_faculty(dashboard):
+    mid = dashboard.MIDTERM_WEEK
+    got = _parse(dashboard, [
+        ("FIN", mid, " Prof. A + Prof. B (Postmid) "),  # not DTI: never split
+        ("FIN", mid + 1, "Prof. A"),
+        (" dti ", mid + 1, "Prof. C"),                   # DTI without a combined string
+        ("MKT", 1, None),
+        ("MKT", 1, "  "),
+    ])
+
+    assert got == ["Prof. A + Prof. B (Postmid)", "Prof. A", "Prof. C", "Unknown Faculty", "Unknown Faculty"]
+
+
+def test_dti_case_and_whitespace_insensitive(dashboard):
+    mid = dashboard.MIDTERM_WEEK
+    got = _parse(dashboard, [(" dti ", mid + 1, f"  {DTI_FACULTY}  ")])
+
+    assert got == ["Prof. Rojers Puthur Josrph (Postmid)"]
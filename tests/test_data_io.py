@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from data_io import (
+    FACULTY_OVERRIDES, fresh_parquet, group_lists, read_arrow_table, read_faculty_overrides, write_arrow_table,
+)
+
+
+def test_write_arrow_table_leaves_fresh_parquet(tmp_path):
+    csv_path = tmp_path / "slots.csv"
+    tbl = pa.table({"slot_id": ["W1_D1_S1", "W1_D1_S2"], "room_capacity": [10, 4]})
+
+    write_arrow_table(tbl, csv_path)
+
+    assert csv_path.exists()
+    assert fresh_parquet(csv_path) is not None
+    assert read_arrow_table(csv_path).equals(tbl)
+
+
+def test_write_arrow_table_matches_pandas_csv(tmp_path):
+    csv_path = tmp_path / "slots.csv"
+    tbl = pa.table({"slot_id": ["W1_D1_S1", "W1_D1_S2"], "day": ["Mon", None], "room_capacity": [10, 4]})
+
+    write_arrow_table(tbl, csv_path)
+
+    assert csv_path.read_text() == tbl.to_pandas().to_csv(index=False)
+
+
+def test_write_arrow_table_quotes_structural_characters(tmp_path):
+    csv_path = tmp_path / "courses.csv"
+    tbl = pa.table({"course_id": ["A,B", 'Q"R', "N\nL", "plain"], "credits": [1, 2, 3, 4]})
+
+    write_arrow_table(tbl, csv_path)
+
+    back = pd.read_csv(csv_path)
+    assert back["course_id"].tolist() == ["A,B", 'Q"R', "N\nL", "plain"]
+    assert back["credits"].tolist() == [1, 2, 3, 4]
+
+
+def test_read_faculty_overrides_blank_cells_are_missing(tmp_path):
+    csv_path = tmp_path / "courses_faculty_overrides.csv"
+    csv_path.write_text("course_id,faculty_premid,faculty_postmid\nDTI,Prof. Rohit Kumar,\nFIN, ,Prof. X\n")
+
+    ov = read_faculty_overrides(csv_path)
+
+    assert ov.loc["DTI", "faculty_premid"] == "Prof. Rohit Kumar"
+    assert pd.isna(ov.loc["DTI", "faculty_postmid"])
+    assert pd.isna(ov.loc["FIN", "faculty_premid"])
+    assert ov.loc["FIN", "faculty_postmid"] == "Prof. X"
+
+
+def test_read_faculty_overrides_rejects_duplicate_courses(tmp_path):
+    csv_path = tmp_path / "courses_faculty_overrides.csv"
+    csv_path.write_text("course_id,faculty_premid,faculty_postmid\nDTI,A,B\nDTI,C,D\n")
+
+    with pytest.raises(ValueError, match="DTI"):
+        read_faculty_overrides(csv_path)
+
+
+def test_read_faculty_overrides_falls_back_to_constant(tmp_path):
+    ov = read_faculty_overrides(tmp_path / "missing.csv")
+
+    assert ov.index.tolist() == [o["course_id"] for o in FACULTY_OVERRIDES]
+
+
+def test_group_lists_matches_groupby_agg_list():
+    keys = ["s3", "s1", "s2", "s1", "s3", "s1", "s4"]
+    values = ["C", "A", "B", "D", "A", "B", "E"]
+
+    expected = pd.Series(values).groupby(pd.Series(keys), sort=True).agg(list).to_dict()
+    got = group_lists(np.array(keys), np.array(values))
+
+    assert got == expected
+    assert list(got) == sorted(set(keys))  # keys in sorted order
+    assert got["s1"] == ["A", "D", "B"]    # values keep their input order within a key
+    assert got["s4"] == ["E"]              # single-element key
+
+
+def test_group_lists_random_matches_groupby():
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, 50, size=500).astype(str)
+    values = np.arange(500)
+
+    expected = pd.Series(values).groupby(keys, sort=True).agg(list).to_dict()
+
+    assert group_lists(keys, values) == expected
+
+
+def test_group_lists_empty():
+    assert group_lists(np.array([], dtype=str), np.array([], dtype=str)) == {}
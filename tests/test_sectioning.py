@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+
+def _mismatches(assign, bucket):
+    return sum(assign[sid] != bucket[sid] for sid in assign)
+
+
+def _sizes(assign):
+    size_b = sum(assign.values())
+    return len(assign) - size_b, size_b
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_greedy_ab_assignment_matches_cp_sat(load_script, seed):
+    mod = load_script("02c_sectioning_ilp")
+    rng = random.Random(seed)
+
+    n = rng.randint(mod.MAX_CAP + 1, 2 * mod.MAX_CAP)
+    students = [f"S{i:03d}" for i in range(n)]
+    # Skewed buckets, so some courses need students moved across the split
+    share_b = rng.choice([0.0, 0.1, 0.5, 0.9, 1.0, rng.random()])
+    bucket = {sid: int(rng.random() < share_b) for sid in students}
+
+    greedy, k_greedy = mod.greedy_ab_assignment(students, bucket, f"C{seed}")
+    exact, k_exact = mod.solve_ab_assignment(students, bucket, f"C{seed}")
+
+    assert k_greedy == k_exact == 2
+    assert _mismatches(greedy, bucket) == _mismatches(exact, bucket)
+    for size in _sizes(greedy):
+        assert mod.MIN_CAP <= size <= mod.MAX_CAP
+
+
+@pytest.mark.parametrize("bucket_value, expected_sizes", [(0, (70, 30)), (1, (30, 70))])
+def test_greedy_ab_assignment_clamps_to_the_bounds(load_script, bucket_value, expected_sizes):
+    # 100 students all in one bucket: A is clamped down to MAX_CAP (bucket 0)
+    # or up to N - MAX_CAP (bucket 1)
+    mod = load_script("02c_sectioning_ilp")
+    students = [f"S{i:03d}" for i in range(100)]
+    bucket = {sid: bucket_value for sid in students}
+
+    greedy, _ = mod.greedy_ab_assignment(students, bucket, "ALL")
+    exact, _ = mod.solve_ab_assignment(students, bucket, "ALL")
+
+    assert _sizes(greedy) == expected_sizes
+    assert _mismatches(greedy, bucket) == _mismatches(exact, bucket) == 30
+
+
+def test_greedy_ab_assignment_keeps_small_courses_whole(load_script):
+    mod = load_script("02c_sectioning_ilp")
+    students = [f"S{i:03d}" for i in range(mod.MAX_CAP)]
+    bucket = {sid: i % 2 for i, sid in enumerate(students)}
+
+    greedy, k = mod.greedy_ab_assignment(students, bucket, "SMALL")
+
+    assert k == 1
+    assert set(greedy.values()) == {0}